@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from schema import CountryEntityIndex, KoreaDemocracyDataIntegrator
+
+COUNTRY_NAMES = [
+    'South Korea', 'North Korea', 'Japan', 'China', 'Ukraine', 'Germany', 'France',
+    'Brazil', 'Finland', 'Norway', 'India', 'Mexico', 'Kenya', 'Chile', 'Canada'
+]
+ISO_CODES = ['KOR', 'PRK', 'JPN', 'CHN', 'UKR', 'DEU', 'FRA', 'BRA', 'FIN', 'NOR', 'IND', 'MEX', 'KEN', 'CHL', 'CAN']
+
+LEGACY_KOREA_PATTERNS = [
+    'kor', 'kr', 'rok', '410', '732',
+    'south korea', 'korea', 'republic of korea', 'korea, south',
+    'korea (south)', 's. korea', 's korea', 'korean',
+    'corée du sud', 'corée', 'coree du sud', 'coree',
+    'corea del sur', 'corea',
+    'coreia do sul', 'coreia',
+    'korea south', 'south-korea'
+]
+
+
+def legacy_find_korea_data(df):
+    korea_rows = []
+    korea_columns = []
+
+    for col in df.columns:
+        if df[col].dtype == 'object':
+            col_values = df[col].astype(str).str.lower().fillna('')
+
+            for pattern in LEGACY_KOREA_PATTERNS:
+                mask = col_values.str.contains(pattern, na=False, regex=False)
+                if mask.any():
+                    korea_rows.extend(df[mask].index.tolist())
+                    if col not in korea_columns:
+                        korea_columns.append(col)
+
+    return list(set(korea_rows)), korea_columns
+
+
+def make_frame(n_rows, n_columns, seed=0):
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(COUNTRY_NAMES), n_rows)
+    data = {
+        'country': np.array(COUNTRY_NAMES, dtype=object)[picks],
+        'iso': np.array(ISO_CODES, dtype=object)[picks],
+        'year': rng.integers(1900, 2025, n_rows),
+    }
+    for i in range(max(0, n_columns - len(data))):
+        if i % 2:
+            data[f'v{i}'] = rng.random(n_rows)
+        else:
+            data[f'note_{i}'] = np.array(['n/a', 'estimate', 'revised', ''], dtype=object)[rng.integers(0, 4, n_rows)]
+    return pd.DataFrame(data)
+
+
+def time_call(func, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark():
+    integrator = KoreaDemocracyDataIntegrator('.')
+    integrator.country_index = CountryEntityIndex().build(
+        integrator.collect_country_aliases(make_frame(1_000, 3)),
+        seeds={integrator.target_country: integrator.target_country_names}
+    )
+    cases = [(rows, 10) for rows in (1_000, 10_000, 100_000)] + [(10_000, cols) for cols in (20, 50, 100)]
+
+    print(f"{'rows':>8} {'cols':>5} {'legacy (ms)':>12} {'matcher (ms)':>13} {'speedup':>8}")
+    for n_rows, n_columns in cases:
+        df = make_frame(n_rows, n_columns)
+        legacy = time_call(lambda: legacy_find_korea_data(df))
+        current = time_call(lambda: integrator.find_korea_data(df))
+        print(f"{n_rows:>8} {n_columns:>5} {legacy * 1000:>12.1f} {current * 1000:>13.1f} {legacy / current:>7.1f}x")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from schema import KoreaDemocracyDataIntegrator
+
+
+def run_benchmark(n_rows=1_000_000):
+    integrator = KoreaDemocracyDataIntegrator('.')
+    table = integrator.build_scale_table()
+    scaled = table[table['scale_min'].notna()]
+
+    rng = np.random.default_rng(0)
+    picks = rng.integers(0, len(scaled), n_rows)
+    values = rng.uniform(-10, 180, n_rows)
+    values[rng.random(n_rows) < 0.05] = np.nan
+    scales = scaled.iloc[picks]
+
+    start = time.perf_counter()
+    vectorized = integrator.normalize_array(values, scales['scale_min'].to_numpy(),
+                                            scales['scale_max'].to_numpy(),
+                                            scales['reverse'].to_numpy(dtype=bool))
+    vectorized_time = time.perf_counter() - start
+
+    sample = 100_000
+    scale_ranges = list(zip(scales['scale_min'].to_numpy()[:sample], scales['scale_max'].to_numpy()[:sample]))
+    reverse = scales['reverse'].to_numpy(dtype=bool)[:sample]
+    start = time.perf_counter()
+    scalar = [integrator.normalize_to_democracy_scale(value, scale_range, flag)
+              for value, scale_range, flag in zip(values[:sample], scale_ranges, reverse)]
+    scalar_time = (time.perf_counter() - start) * n_rows / sample
+
+    assert np.allclose(vectorized[:sample], scalar, equal_nan=True)
+    print(f"rows: {n_rows:,}")
+    print(f"normalize_array: {vectorized_time * 1000:.1f} ms")
+    print(f"per-value calls (extrapolated from {sample:,}): {scalar_time * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+
+import argparse
+import itertools
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from schema import KoreaDemocracyDataIntegrator, StageProfiler
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+GOLDEN_FILE = BENCHMARK_DIR / 'golden' / 'synthetic_1x.json'
+RESULTS_DIR = BENCHMARK_DIR / 'results'
+
+STAGES = ['country_index', 'read', 'match', 'years', 'indicators', 'normalize',
+          'assembly', 'gap_fill', 'serialize', 'coverage_analysis']
+LOAD_MODES = ['full', 'projected', 'stream']
+# integrator profiler stages reported under a different benchmark stage
+PROFILER_STAGES = {'merge': 'assembly', 'coverage': 'coverage_analysis'}
+
+# (iso, polity scode, polity ccode, name, french name)
+REAL_COUNTRIES = [
+    ('KOR', 'ROK', 732, 'South Korea', 'Corée du Sud'),
+    ('PRK', 'PRK', 731, 'North Korea', 'Corée du Nord'),
+    ('JPN', 'JPN', 740, 'Japan', 'Japon'),
+    ('CHN', 'CHN', 710, 'China', 'Chine'),
+    ('UKR', 'UKR', 369, 'Ukraine', 'Ukraine'),
+    ('DEU', 'GMY', 255, 'Germany', 'Allemagne'),
+    ('FRA', 'FRN', 220, 'France', 'France'),
+    ('BRA', 'BRA', 140, 'Brazil', 'Brésil'),
+    ('FIN', 'FIN', 375, 'Finland', 'Finlande'),
+    ('NOR', 'NOR', 385, 'Norway', 'Norvège'),
+    ('IND', 'IND', 750, 'India', 'Inde'),
+    ('MEX', 'MEX', 70, 'Mexico', 'Mexique'),
+    ('KEN', 'KEN', 501, 'Kenya', 'Kenya'),
+    ('CHL', 'CHL', 155, 'Chile', 'Chili'),
+    ('CAN', 'CAN', 20, 'Canada', 'Canada'),
+]
+
+POLITY_COLUMNS = ['p5', 'cyear', 'ccode', 'scode', 'country', 'year', 'flag', 'fragment', 'democ', 'autoc',
+                  'polity', 'polity2', 'durable', 'xrreg', 'xrcomp', 'xropen', 'xconst', 'parreg', 'parcomp',
+                  'exrec', 'exconst', 'polcomp', 'prior', 'emonth', 'eday', 'eyear', 'eprec', 'interim',
+                  'bmonth', 'bday', 'byear', 'bprec', 'post', 'change', 'd5', 'sf', 'regtrans']
+VDEM_INDICES = ['v2x_libdem', 'v2x_polyarchy', 'v2x_api', 'v2x_mpi', 'v2x_freexp_altinf', 'v2xlg_legcon',
+                'v2x_jucon', 'v2xcs_ccsi', 'v2x_corr', 'v2x_civlib', 'v2xcl_rol', 'v2x_clphy', 'v2x_clpriv',
+                'v2x_clpol', 'v2xeg_eqprotec', 'v2xeg_eqaccess', 'v2xeg_eqdr']
+RSF_CONTEXTS = ['Political Context', 'Economic Context', 'Legal Context', 'Social Context', 'Safety']
+
+
+def synthetic_countries(count):
+    real_codes = {code for country in REAL_COUNTRIES for code in country[:2]}
+    codes = (''.join(letters) for letters in itertools.product('ABCDEFGHIJKLMNOPQRSTUVWXYZ', repeat=3))
+    codes = (code for code in codes if code not in real_codes)
+
+    countries = list(REAL_COUNTRIES[:count])
+    for i, code in zip(range(len(countries), count), codes):
+        name = f"Synthland {i:05d}"
+        countries.append((code, code, 1000 + i, name, name))
+    return countries
+
+
+def polity_frame(countries, rng):
+    rows = []
+    for iso, scode, ccode, name, _ in countries:
+        start = 1948 if iso == 'KOR' else int(rng.integers(1800, 1990))
+        rows.append(pd.DataFrame({'ccode': ccode, 'scode': scode, 'country': 'Korea South' if iso == 'KOR' else name,
+                                  'year': np.arange(start, 2019)}))
+    # pre-partition Korea shares the KOR code with the modern state, as in the real release
+    rows.append(pd.DataFrame({'ccode': 730, 'scode': 'KOR', 'country': 'Korea', 'year': np.arange(1800, 1911)}))
+    df = pd.concat(rows, ignore_index=True)
+
+    n = len(df)
+    df['p5'] = 0
+    df['cyear'] = df['ccode'] * 10000 + df['year']
+    df['flag'] = 0
+    df['fragment'] = np.where(rng.random(n) < 0.9, np.nan, rng.integers(0, 3, n))
+    df['democ'] = rng.integers(0, 11, n)
+    df['autoc'] = rng.integers(0, 11, n)
+    df['polity'] = df['democ'] - df['autoc']
+    df['polity2'] = df['polity']
+    df['durable'] = np.where(rng.random(n) < 0.1, np.nan, rng.integers(0, 200, n))
+    for col in POLITY_COLUMNS:
+        if col not in df:
+            df[col] = np.where(rng.random(n) < 0.7, np.nan, rng.integers(1, 99, n))
+    return df[POLITY_COLUMNS]
+
+
+def vdem_frame(countries, rng):
+    years = np.arange(2000, 2025)
+    df = pd.DataFrame({
+        'country_name': np.repeat([country[3] for country in countries], len(years)),
+        'country_id': np.repeat(np.arange(1, len(countries) + 1), len(years)),
+        'country_text_id': np.repeat([country[0] for country in countries], len(years)),
+        'year': np.tile(years, len(countries)),
+    })
+    for col in VDEM_INDICES:
+        df[col] = rng.random(len(df)).round(3)
+    return df
+
+
+def freedomhouse_frame(countries, years, rng):
+    df = pd.DataFrame({
+        'country': np.repeat([country[3] for country in countries], len(years)),
+        'year': np.tile(years, len(countries)),
+    })
+    df['pr'] = rng.integers(1, 8, len(df))
+    df['cl'] = rng.integers(1, 8, len(df))
+    df['status'] = np.select([df['pr'] + df['cl'] <= 5, df['pr'] + df['cl'] <= 10], ['F', 'PF'], 'NF')
+    df['total'] = rng.integers(0, 101, len(df))
+    return df
+
+
+def rsf_frame(countries, year, rng):
+    n = len(countries)
+    scores = rng.uniform(0, 100, n).round(2)
+    ranks = (np.argsort(np.argsort(-scores)) + 1)
+    previous = (scores + rng.normal(0, 3, n)).round(2)
+    previous_ranks = (np.argsort(np.argsort(-previous)) + 1)
+    names = {
+        'ISO': [country[0] for country in countries],
+        'EN': [country[3] for country in countries],
+        'FR': [country[4] for country in countries],
+    }
+
+    if year < 2022:
+        df = pd.DataFrame({
+            'Year (N)': year, 'ISO': names['ISO'], 'Rank N': ranks, 'Score N': scores,
+            'Score N without the exactions': np.where(year < 2013, np.nan, scores),
+            'Score N with the exactions': np.where(year < 2013, np.nan, (scores * 1.05).round(2)),
+            'Score exactions': np.where(year < 2013, np.nan, rng.uniform(0, 100, n).round(2)),
+            'Rank N-1': previous_ranks, 'Score N-1': previous, 'Rank evolution': previous_ranks - ranks,
+            'FR_country': names['FR'], 'EN_country': names['EN'], 'ES_country': names['EN'],
+            'AR_country': names['EN'], 'FA_country': names['EN'], 'Zone': 'Asie-Pacifique',
+        })
+        return df
+
+    df = pd.DataFrame({'ISO': names['ISO'], 'Score 2025' if year == 2025 else 'Score': scores, 'Rank': ranks})
+    for context, suffix in zip(RSF_CONTEXTS, ['Pol', 'Eco', 'Leg', 'Soc', 'Saf']):
+        df[context] = rng.uniform(0, 100, n).round(2)
+        df[f'Rank_{suffix}'] = np.argsort(np.argsort(-df[context].to_numpy())) + 1
+    df['Zone'] = 'Asie-Pacifique'
+    for language in ['FR', 'EN', 'ES', 'PT', 'AR', 'FA']:
+        df[f'Country_{language}'] = names.get(language, names['EN'])
+    df['Year (N)'] = year
+    df['Rank N-1'] = previous_ranks
+    df['Rank evolution'] = previous_ranks - ranks
+    df['Score N-1'] = previous
+    df['Score evolution'] = (scores - previous).round(2)
+    return df
+
+
+def generate_dataset(root, scale, seed=0):
+    rng = np.random.default_rng(seed)
+    root = Path(root)
+    rows = {}
+
+    def write(df, relative_path, **kwargs):
+        path = root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(path, index=False, **kwargs)
+        rows[relative_path] = len(df)
+
+    write(polity_frame(synthetic_countries(195 * scale), rng), 'Polity5/p5v2018.csv')
+    write(vdem_frame(synthetic_countries(55 * scale), rng), 'V-Dem/V-Dem-processed.csv')
+    countries = synthetic_countries(210 * scale)
+    write(freedomhouse_frame(countries, np.arange(2013, 2026), rng), 'freedomhouse/All_data_FIW_processed.csv')
+    write(freedomhouse_frame(countries, np.arange(2003, 2026), rng),
+          'freedomhouse/Country_and_Territory_Ratings_processed.csv')
+
+    countries = synthetic_countries(180 * scale)
+    for year in range(2002, 2026):
+        # both RSF schema eras: semicolons and decimal commas throughout, BOM until 2025, latin-1 in 2025
+        encoding = 'latin-1' if year == 2025 else 'utf-8-sig'
+        write(rsf_frame(countries, year, rng), f'RSF/{year}.csv', sep=';', decimal=',', encoding=encoding)
+
+    return rows
+
+
+def run_pipeline(dataset_root, output_dir, load_mode):
+    seconds = dict.fromkeys(STAGES, 0.0)
+
+    def record_stage(record):
+        # self time, so a stage nested inside another is not counted twice
+        stage = PROFILER_STAGES.get(record['stage'], record['stage'])
+        if stage in seconds:
+            seconds[stage] += record['self_seconds']
+
+    integrator = KoreaDemocracyDataIntegrator(str(dataset_root), load_mode=load_mode,
+                                              profiler=StageProfiler(callbacks=[record_stage]))
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    results = integrator.integrate_all_datasets()
+    integrator.save_web_data(results['web_data'], str(output_dir / 'korea_democracy_data.json'))
+    integrator.build_coverage_report(results)
+    total = time.perf_counter() - start
+
+    return results['web_data'], seconds, total
+
+
+def canonical_web_data(web_data):
+    payload = dict(web_data, metadata={key: value for key, value in web_data['metadata'].items()
+                                       if key != 'generated_at'})
+    return json.loads(json.dumps(payload, sort_keys=True, default=str))
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCHMARK_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_results(current, baseline):
+    print(f"\nChange against {baseline.get('commit') or 'baseline'}:")
+    for scale, scale_results in current['scales'].items():
+        baseline_modes = baseline.get('scales', {}).get(scale, {}).get('modes', {})
+        for mode, mode_results in scale_results['modes'].items():
+            previous = baseline_modes.get(mode)
+            if not previous:
+                continue
+            for stage, seconds in mode_results['stages'].items():
+                before = previous['stages'].get(stage)
+                if before:
+                    print(f"  {scale:>4}x {mode:<10} {stage:<18} {before * 1000:9.1f} -> {seconds * 1000:9.1f} ms "
+                          f"({seconds / before:5.2f}x)")
+
+
+def run_benchmark(scales, modes, output=None, baseline=None, update_golden=False, seed=0):
+    report = {
+        'generated_at': datetime.now().isoformat(),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'seed': seed,
+        'scales': {},
+        'checks': {}
+    }
+    failures = []
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for scale in scales:
+            dataset_root = Path(temp_dir) / f'dataset_{scale}x'
+            start = time.perf_counter()
+            rows = generate_dataset(dataset_root, scale, seed)
+            print(f"\n{scale}x: generated {sum(rows.values()):,} rows in {time.perf_counter() - start:.1f} s")
+
+            scale_results = {'rows': rows, 'modes': {}}
+            reference = None
+            for mode in modes:
+                web_data, stages, total = run_pipeline(dataset_root, Path(temp_dir) / f'output_{scale}x_{mode}', mode)
+                scale_results['modes'][mode] = {'stages': stages, 'total': total}
+
+                print(f"  {mode:<10} total {total * 1000:9.1f} ms  " +
+                      "  ".join(f"{stage} {seconds * 1000:.1f}" for stage, seconds in stages.items() if seconds))
+
+                web_data = canonical_web_data(web_data)
+                if reference is None:
+                    reference = web_data
+                    continue
+                report['checks'][f'{scale}x_{mode}_matches_{modes[0]}'] = web_data == reference
+                if web_data != reference:
+                    failures.append(f"{scale}x {mode} output differs from {modes[0]}")
+
+            if scale == 1 and seed == 0 and reference is not None:
+                if update_golden or not GOLDEN_FILE.exists():
+                    GOLDEN_FILE.parent.mkdir(parents=True, exist_ok=True)
+                    with open(GOLDEN_FILE, 'w', encoding='utf-8') as f:
+                        json.dump(reference, f, indent=1, sort_keys=True, ensure_ascii=False)
+                    print(f"  golden output written to {GOLDEN_FILE}")
+                else:
+                    with open(GOLDEN_FILE, encoding='utf-8') as f:
+                        matches = json.load(f) == reference
+                    report['checks']['1x_matches_golden'] = matches
+                    if not matches:
+                        failures.append(f"1x output differs from {GOLDEN_FILE.name}")
+
+            report['scales'][str(scale)] = scale_results
+
+    output = Path(output) if output else RESULTS_DIR / f"pipeline_{report['commit'] or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to {output}")
+
+    if baseline:
+        with open(baseline, encoding='utf-8') as f:
+            compare_results(report, json.load(f))
+
+    for failure in failures:
+        print(f"GOLDEN CHECK FAILED: {failure}")
+    return report, failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time every pipeline stage on synthetic copies of the dataset layouts")
+    parser.add_argument('--scales', default='1,10,100', help="comma-separated scale factors")
+    parser.add_argument('--modes', default=','.join(LOAD_MODES), help="comma-separated load modes to time and compare")
+    parser.add_argument('--output', help="results JSON (default: benchmarks/results/pipeline_<commit>.json)")
+    parser.add_argument('--compare', help="earlier results JSON to report per-stage changes against")
+    parser.add_argument('--update-golden', action='store_true', help="rewrite the 1x golden output")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    _, failures = run_benchmark([int(scale) for scale in args.scales.split(',')], args.modes.split(','),
+                                output=args.output, baseline=args.compare,
+                                update_golden=args.update_golden, seed=args.seed)
+    raise SystemExit(1 if failures else 0)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+
+import argparse
+import http.client
+import json
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlencode, urlparse
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmark_pipeline import RESULTS_DIR, generate_dataset, git_commit
+from schema import KoreaDemocracyDataIntegrator, TimelineQueryStore, make_query_server
+
+
+def start_local_server(dataset_root, output_dir):
+    integrator = KoreaDemocracyDataIntegrator(str(dataset_root))
+    long_table = integrator.integrate_all_countries(output_dir=str(output_dir))['long_table']
+    server = make_query_server(TimelineQueryStore(long_table), port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def fetch_json(url):
+    target = urlparse(url)
+    connection = http.client.HTTPConnection(target.hostname, target.port)
+    connection.request('GET', target.path)
+    body = connection.getresponse().read()
+    connection.close()
+    return json.loads(body)
+
+
+def query_mix(base_url, count, seed=0):
+    # random year windows over random countries, a third filtered to one dataset or a few indicators
+    rng = np.random.default_rng(seed)
+    countries = fetch_json(f"{base_url}/countries")['countries']
+    indicators = fetch_json(f"{base_url}/indicators")['indicators']
+    datasets = sorted({entry['dataset'] for entry in indicators})
+
+    paths = []
+    for _ in range(count):
+        country = countries[rng.integers(len(countries))]
+        first, last = country['year_range']
+        start = int(rng.integers(first, last + 1))
+        params = {'country': country['key'], 'start': start, 'end': int(rng.integers(start, last + 1))}
+        kind = rng.integers(3)
+        if kind == 1:
+            params['dataset'] = datasets[rng.integers(len(datasets))]
+        elif kind == 2:
+            picked = rng.choice(len(indicators), size=min(3, len(indicators)), replace=False)
+            params['indicator'] = ','.join(indicators[i]['indicator'] for i in picked)
+        paths.append(f"/query?{urlencode(params)}")
+    return paths
+
+
+def run_load_test(base_url, requests, concurrency, revalidate=0.5, use_gzip=True, seed=0):
+    paths = query_mix(base_url, requests, seed)
+    target = urlparse(base_url)
+    latencies = np.zeros(len(paths))
+    statuses = [None] * len(paths)
+    received = [0] * len(paths)
+    next_request = iter(range(len(paths)))
+    lock = threading.Lock()
+
+    def worker(worker_seed):
+        rng = np.random.default_rng(worker_seed)
+        connection = http.client.HTTPConnection(target.hostname, target.port)
+        etags = {}
+        while True:
+            with lock:
+                i = next(next_request, None)
+            if i is None:
+                break
+            headers = {'Accept-Encoding': 'gzip'} if use_gzip else {}
+            # a share of requests repeat a query this client already holds, as a browser cache would
+            if etags and rng.random() < revalidate:
+                path, etag = list(etags.items())[rng.integers(len(etags))]
+                paths[i] = path
+                headers['If-None-Match'] = etag
+            started = time.perf_counter()
+            try:
+                connection.request('GET', paths[i], headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection(target.hostname, target.port)
+                statuses[i] = 'error'
+                continue
+            latencies[i] = time.perf_counter() - started
+            statuses[i] = response.status
+            received[i] = len(body)
+            if response.status == 200:
+                etags[paths[i]] = response.getheader('ETag')
+        connection.close()
+
+    threads = [threading.Thread(target=worker, args=(seed + n,)) for n in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    answered = latencies[[status != 'error' for status in statuses]] * 1000
+    status_counts = {}
+    for status in statuses:
+        status_counts[str(status)] = status_counts.get(str(status), 0) + 1
+    return {
+        'requests': len(paths),
+        'concurrency': concurrency,
+        'revalidate': revalidate,
+        'gzip': use_gzip,
+        'seconds': elapsed,
+        'requests_per_second': len(paths) / elapsed,
+        'latency_ms': {
+            'p50': float(np.percentile(answered, 50)) if len(answered) else None,
+            'p95': float(np.percentile(answered, 95)) if len(answered) else None,
+            'p99': float(np.percentile(answered, 99)) if len(answered) else None,
+            'max': float(answered.max()) if len(answered) else None
+        },
+        'statuses': status_counts,
+        'bytes_received': sum(received)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the timeline query server (schema.py --serve)")
+    parser.add_argument('--url', help="running server to test; by default one is started on synthetic data")
+    parser.add_argument('--dataset-root', help="dataset for the in-process server instead of synthetic data")
+    parser.add_argument('--scale', type=int, default=1, help="synthetic dataset scale for the in-process server")
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--revalidate', type=float, default=0.5,
+                        help="share of requests that repeat a cached query with If-None-Match")
+    parser.add_argument('--no-gzip', action='store_true')
+    parser.add_argument('--output', help="results JSON (default: benchmarks/results/query_server_<commit>.json)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        server = None
+        base_url = args.url
+        if base_url is None:
+            dataset_root = args.dataset_root
+            if dataset_root is None:
+                dataset_root = Path(temp_dir) / 'dataset'
+                generate_dataset(dataset_root, args.scale, args.seed)
+            server, base_url = start_local_server(dataset_root, Path(temp_dir) / 'countries')
+
+        report = run_load_test(base_url.rstrip('/'), args.requests, args.concurrency,
+                               revalidate=args.revalidate, use_gzip=not args.no_gzip, seed=args.seed)
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    report.update({'generated_at': datetime.now().isoformat(), 'commit': git_commit(), 'url': args.url})
+    latency = report['latency_ms']
+    print(f"{report['requests']} requests, {report['concurrency']} clients: "
+          f"{report['requests_per_second']:,.0f} req/s, p50 {latency['p50']:.2f} ms, "
+          f"p99 {latency['p99']:.2f} ms, max {latency['max']:.2f} ms")
+    print(f"Statuses: {report['statuses']}, {report['bytes_received']:,} bytes received")
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"query_server_{report['commit'] or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to {output}")
+
+    raise SystemExit(1 if set(report['statuses']) - {'200', '304'} else 0)
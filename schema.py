@@ -10,24 +10,787 @@ import re
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 import warnings
+import argparse
+import hashlib
+import pickle
+import time
+import tracemalloc
+import gzip
+import logging
+import math
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 warnings.filterwarnings('ignore')
 
+logger = logging.getLogger('korea_democracy')
+
+CSV_DELIMITERS = [',', ';', '\t', '|']
+CSV_ENCODINGS = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1', 'utf-8-sig']
+
+def detect_csv_dialect(file_path: Path, sample_size: int = 64 * 1024) -> Dict[str, Any]:
+    with open(file_path, 'rb') as f:
+        head = f.read(sample_size)
+        complete = not f.read(1)
+
+    if head.startswith(b'\xef\xbb\xbf'):
+        encoding = 'utf-8-sig'
+    elif head.startswith((b'\xff\xfe', b'\xfe\xff')):
+        encoding = 'utf-16'
+    else:
+        encoding = 'utf-8'
+
+    if not complete and encoding != 'utf-16':
+        # drop the trailing partial line so a multi-byte character cut at the boundary still decodes
+        head = head[:head.rfind(b'\n') + 1] or head
+    try:
+        text = head.decode(encoding)
+    except UnicodeDecodeError:
+        encoding = 'latin-1'
+        text = head.decode(encoding)
+
+    lines = [line for line in text.splitlines() if line.strip()]
+
+    delimiter, width = ',', 0
+    best_score = (0.0, 0)
+    for candidate in CSV_DELIMITERS:
+        widths = [len(row) for row in csv.reader(lines, delimiter=candidate)]
+        if not widths:
+            continue
+        mode_width = max(set(widths), key=widths.count)
+        score = (widths.count(mode_width) / len(widths), mode_width)
+        if mode_width > 1 and score > best_score:
+            best_score = score
+            delimiter, width = candidate, mode_width
+
+    rows = list(csv.reader(lines, delimiter=delimiter))
+    header = next((i for i, row in enumerate(rows) if len(row) == width), 0)
+
+    decimal = '.'
+    if delimiter != ',':
+        fields = [field.strip() for row in rows[header + 1:] for field in row]
+        comma_decimals = sum(1 for field in fields if re.fullmatch(r'-?\d+,\d+', field))
+        dot_decimals = sum(1 for field in fields if re.fullmatch(r'-?\d+\.\d+', field))
+        if comma_decimals > dot_decimals:
+            decimal = ','
+
+    return {
+        'encoding': encoding,
+        'delimiter': delimiter,
+        'decimal': decimal,
+        'header': header
+    }
+
+def widen_float32(values: pd.Series) -> pd.Series:
+    # projected loads keep scores as float32; going through the shortest decimal repr gives back
+    # the float64 a full load would have parsed for any value with up to 7 significant digits,
+    # which compact_dtypes checks before narrowing a column
+    if values.dtype != np.float32:
+        return values
+    return pd.to_numeric(values.astype(str), errors='coerce')
+
+def map_unique_values(values: pd.Series, mapper, missing: Any = None, dtype: Any = object) -> np.ndarray:
+    # each distinct value is mapped once; factorize marks missing values with -1, which indexes the trailing entry
+    codes, uniques = pd.factorize(values)
+    return np.array([mapper(value) for value in uniques] + [missing], dtype=dtype)[codes]
+
+def read_csv_with_dialect(file_path: Path, dialect: Dict[str, Any], **kwargs) -> pd.DataFrame:
+    return pd.read_csv(file_path,
+                       encoding=dialect['encoding'],
+                       delimiter=dialect['delimiter'],
+                       decimal=dialect['decimal'],
+                       skiprows=dialect['header'],
+                       low_memory=False,
+                       on_bad_lines='skip',
+                       **kwargs)
+
+def current_rss_bytes() -> Optional[int]:
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+def to_native(value, precision: Optional[int] = None):
+    # one pass over a payload: NumPy values become Python ones and floats are rounded, so json.dumps needs no fallback
+    if isinstance(value, dict):
+        return {key.item() if isinstance(key, np.generic) else key: to_native(item, precision)
+                for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_native(item, precision) for item in value]
+    if isinstance(value, np.ndarray):
+        return to_native(value.tolist(), precision)
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            return None
+        return round(value, precision) if precision is not None else value
+    if value is None or isinstance(value, (str, int)):
+        return value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+def write_file_atomic(output_file, data: bytes):
+    # readers such as the web app see either the previous file or the complete new one
+    output_file = Path(output_file)
+    temp_path = output_file.with_name(f".{output_file.name}.{os.getpid()}.tmp")
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, output_file)
+
+def file_sha256(file_path: Path):
+    # the running digest is returned so callers can fold settings in after the content
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest
+
+class DialectManifest:
+    def __init__(self, manifest_path: Path):
+        self.manifest_path = Path(manifest_path)
+        self.entries = {}
+        self.changed = False
+
+        if self.manifest_path.exists():
+            try:
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def entry_key(self, file_path: Path) -> str:
+        try:
+            return Path(file_path).resolve().relative_to(self.manifest_path.parent.resolve()).as_posix()
+        except ValueError:
+            return Path(file_path).resolve().as_posix()
+
+    def lookup(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        entry = self.entries.get(self.entry_key(file_path))
+        if entry is None:
+            return None
+        stat = Path(file_path).stat()
+        if entry.get('size') != stat.st_size or entry.get('mtime_ns') != stat.st_mtime_ns:
+            return None
+        return entry['dialect']
+
+    def record(self, file_path: Path, dialect: Dict[str, Any]):
+        stat = Path(file_path).stat()
+        entry = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'dialect': dialect}
+        key = self.entry_key(file_path)
+        if self.entries.get(key) != entry:
+            self.entries[key] = entry
+            self.changed = True
+
+    def resolve(self, file_path: Path) -> Dict[str, Any]:
+        dialect = self.lookup(file_path)
+        if dialect is None:
+            dialect = detect_csv_dialect(file_path)
+            self.record(file_path, dialect)
+        return dialect
+
+    def save(self):
+        if not self.changed:
+            return
+        temp_path = self.manifest_path.with_name(f"{self.manifest_path.name}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True, ensure_ascii=False)
+        os.replace(temp_path, self.manifest_path)
+        self.changed = False
+
+class CountryEntityIndex:
+    ISO_COLUMNS = ['iso', 'iso3', 'iso_code', 'country_text_id']
+
+    def __init__(self):
+        self.aliases = {}
+        self.names = {}
+        self.ambiguous = set()
+
+    @staticmethod
+    def name_key(value) -> Optional[str]:
+        tokens = re.sub(r"[^\w\s]|_", ' ', str(value).casefold()).split()
+        if not tokens or not any(re.search(r'[^\W\d]', token) for token in tokens):
+            return None
+        return 'name:' + ' '.join(sorted(tokens))
+
+    @staticmethod
+    def column_kind(col) -> str:
+        col_lower = str(col).strip().lower()
+        if col_lower in CountryEntityIndex.ISO_COLUMNS:
+            return 'iso'
+        if 'code' in col_lower or col_lower.endswith('_id'):
+            return f'code:{col_lower}'
+        return 'name'
+
+    @staticmethod
+    def alias_key(kind: str, value) -> Optional[str]:
+        if pd.isna(value):
+            return None
+        if kind == 'name':
+            return CountryEntityIndex.name_key(value)
+
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        text = str(value).strip()
+        if not text:
+            return None
+        if kind == 'iso':
+            return f'iso:{text.upper()}' if re.fullmatch(r'[A-Za-z]{3}', text) else None
+        return f'{kind}:{text}'
+
+    def build(self, alias_rows: List[Tuple[Tuple[str, ...], Optional[str]]],
+              seeds: Optional[Dict[str, List[str]]] = None):
+        self.aliases = {}
+        self.names = {}
+        self.ambiguous = set()
+
+        iso_votes = {}
+        for iso_code, seed_names in (seeds or {}).items():
+            for seed_name in seed_names:
+                iso_votes.setdefault(self.name_key(seed_name), set()).add(iso_code)
+
+        # rows that carry an ISO code anchor every code and name in the same row to that entity
+        for keys, display_name in alias_rows:
+            iso_codes = {key[4:] for key in keys if key.startswith('iso:')}
+            if len(iso_codes) != 1:
+                continue
+            iso_code = iso_codes.pop()
+            for key in keys:
+                iso_votes.setdefault(key, set()).add(iso_code)
+            if display_name and iso_code not in self.names:
+                self.names[iso_code] = display_name
+
+        for key, iso_codes in iso_votes.items():
+            if len(iso_codes) == 1:
+                self.aliases[key] = next(iter(iso_codes))
+            else:
+                self.ambiguous.add(key)
+
+        # rows without an ISO code join an entity through any unambiguous alias, or found their own
+        for keys, display_name in alias_rows:
+            if any(key.startswith('iso:') for key in keys):
+                continue
+            known = {self.aliases[key] for key in keys if key in self.aliases}
+            if len(known) > 1:
+                continue
+            names = [key for key in keys if key.startswith('name:') and key not in self.ambiguous]
+            entity = known.pop() if known else (names[0] if names else None)
+            if entity is None:
+                continue
+            for key in keys:
+                if key not in self.ambiguous:
+                    self.aliases.setdefault(key, entity)
+            if display_name and entity not in self.names:
+                self.names[entity] = display_name
+
+        return self
+
+    def resolve(self, key: Optional[str]) -> Optional[str]:
+        if key is None:
+            return None
+        return self.aliases.get(key)
+
+    def resolve_query(self, text: str) -> Optional[str]:
+        return self.resolve(self.alias_key('iso', text)) or self.resolve(self.name_key(text))
+
+    def display_name(self, entity: str) -> str:
+        return self.names.get(entity, entity.split(':', 1)[-1])
+
+    def signature(self) -> str:
+        payload = json.dumps(sorted(self.aliases.items()), ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class ParsedFileCache:
+    CACHE_VERSION = 1
+
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024, rebuild: bool = False):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.rebuild = rebuild
+        self.hits = 0
+        self.misses = 0
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def file_key(self, file_path: Path, settings: Dict[str, Any]) -> str:
+        digest = file_sha256(file_path)
+        digest.update(json.dumps([self.CACHE_VERSION, settings], sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry_path = self.cache_dir / f"{key}.pkl"
+        if self.rebuild or not entry_path.exists():
+            self.misses += 1
+            return None
+
+        try:
+            with open(entry_path, 'rb') as f:
+                value = pickle.load(f)
+            os.utime(entry_path)
+        except Exception:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any):
+        entry_path = self.cache_dir / f"{key}.pkl"
+        temp_path = entry_path.with_name(f"{entry_path.name}.{os.getpid()}.tmp")
+        with open(temp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, entry_path)
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for entry_path in self.cache_dir.glob('*.pkl'):
+            try:
+                stat = entry_path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                entry_path.unlink()
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+
+class BuildManifest:
+    MANIFEST_VERSION = 1
+
+    def __init__(self, manifest_path: str):
+        self.manifest_path = Path(manifest_path)
+        self.settings = None
+        self.files = {}
+        self.datasets = {}
+
+        if self.manifest_path.exists():
+            try:
+                with open(self.manifest_path, 'rb') as f:
+                    state = pickle.load(f)
+                if state.get('version') == self.MANIFEST_VERSION:
+                    self.settings = state['settings']
+                    self.files = state['files']
+                    self.datasets = state['datasets']
+            except Exception:
+                self.files = {}
+                self.datasets = {}
+
+    def diff(self, csv_files: Dict[str, Path]) -> Dict[str, List[str]]:
+        changes = {'added': [], 'changed': [], 'removed': [], 'unchanged': []}
+        for key, csv_file in csv_files.items():
+            entry = self.files.get(key)
+            stat = csv_file.stat()
+            if entry is None:
+                changes['added'].append(key)
+            elif entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                changes['unchanged'].append(key)
+            elif entry['sha256'] == file_sha256(csv_file).hexdigest():
+                # touched but not edited
+                entry.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+                changes['unchanged'].append(key)
+            else:
+                changes['changed'].append(key)
+        changes['removed'] = sorted(set(self.files) - set(csv_files))
+        return changes
+
+    def record(self, key: str, csv_file: Path, aliases: List[Tuple[Tuple[str, ...], Optional[str]]],
+               file_result: Dict[str, Any]):
+        stat = csv_file.stat()
+        self.files[key] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': file_sha256(csv_file).hexdigest(),
+            'aliases': aliases,
+            'result': {name: value for name, value in file_result.items() if name not in ('profile', 'cached')}
+        }
+
+    def save(self):
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.manifest_path.with_name(f"{self.manifest_path.name}.tmp")
+        with open(temp_path, 'wb') as f:
+            pickle.dump({'version': self.MANIFEST_VERSION, 'settings': self.settings,
+                         'files': self.files, 'datasets': self.datasets}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self.manifest_path)
+
+class StageProfiler:
+    def __init__(self, callbacks: Optional[List[Any]] = None, trace_memory: bool = False):
+        self.callbacks = list(callbacks or [])
+        self.trace_memory = trace_memory
+        self.records = []
+        self.active = []
+
+    def __getstate__(self):
+        # callbacks stay with the parent; records made in worker processes travel back with each file result
+        state = self.__dict__.copy()
+        state['callbacks'] = []
+        state['records'] = []
+        state['active'] = []
+        return state
+
+    def add_callback(self, callback):
+        self.callbacks.append(callback)
+
+    def reset(self):
+        self.records = []
+
+    @contextmanager
+    def stage(self, name: str, file_path: Optional[Path] = None, rows_in: Optional[int] = None):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            # the enclosing stage keeps the peak reached so far before the counter restarts for this one
+            if self.active:
+                self.active[-1]['_peak'] = max(self.active[-1]['_peak'], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+
+        record = {'stage': name, 'file': str(file_path) if file_path else None, 'rows_in': rows_in,
+                  'rows_out': None, 'pid': os.getpid(), '_peak': 0, '_children': 0.0}
+        self.active.append(record)
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            wall_seconds = time.perf_counter() - wall_start
+            self.active.pop()
+            peak_so_far = record.pop('_peak')
+            peak_bytes = max(peak_so_far, tracemalloc.get_traced_memory()[1]) if tracing else None
+            record.update({
+                'wall_seconds': wall_seconds,
+                'cpu_seconds': time.process_time() - cpu_start,
+                'self_seconds': wall_seconds - record.pop('_children'),
+                'peak_bytes': peak_bytes,
+                'rss_bytes': current_rss_bytes()
+            })
+            if self.active:
+                self.active[-1]['_children'] += wall_seconds
+                if tracing:
+                    self.active[-1]['_peak'] = max(self.active[-1]['_peak'], peak_bytes)
+            self.emit(record)
+
+    def emit(self, record: Dict[str, Any]):
+        self.records.append(record)
+        logger.debug(f"    [{record['stage']}] {record['wall_seconds'] * 1000:.1f} ms"
+                     + (f" {Path(record['file']).name}" if record['file'] else "")
+                     + (f", rows {record['rows_in']} -> {record['rows_out']}" if record['rows_out'] is not None else ""))
+        for callback in self.callbacks:
+            callback(record)
+
+    def absorb(self, records: Optional[List[Dict[str, Any]]]):
+        for record in records or []:
+            if record['pid'] != os.getpid():
+                self.emit(record)
+
+    def report(self, slowest: int = 10) -> Dict[str, Any]:
+        stages = {}
+        for record in self.records:
+            totals = stages.setdefault(record['stage'], {
+                'count': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'self_seconds': 0.0,
+                'rows_in': 0, 'rows_out': 0, 'peak_bytes': None
+            })
+            totals['count'] += 1
+            for key in ['wall_seconds', 'cpu_seconds', 'self_seconds']:
+                totals[key] += record[key]
+            for key in ['rows_in', 'rows_out']:
+                totals[key] += record[key] or 0
+            if record['peak_bytes'] is not None:
+                totals['peak_bytes'] = max(totals['peak_bytes'] or 0, record['peak_bytes'])
+
+        files = sorted((record for record in self.records if record['stage'] == 'file'),
+                       key=lambda record: record['wall_seconds'], reverse=True)
+        return {
+            'generated_at': datetime.now().isoformat(),
+            'stages': stages,
+            'slowest_files': files[:slowest],
+            'records': self.records
+        }
+
+    def save(self, output_file: str) -> Dict[str, Any]:
+        report = self.report()
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        return report
+
+class YearCoverageMatrix:
+    def __init__(self, dataset_years: Dict[str, List[int]]):
+        self.datasets = list(dataset_years)
+        all_years = [year for years in dataset_years.values() for year in years]
+        first_year = min(all_years) if all_years else 0
+        span = max(all_years) - first_year + 1 if all_years else 0
+
+        # datasets x years, one column per calendar year so runs of True are continuous periods
+        self.years = np.arange(first_year, first_year + span)
+        self.matrix = np.zeros((len(self.datasets), span), dtype=bool)
+        for row, years in enumerate(dataset_years.values()):
+            self.matrix[row, np.asarray(list(years), dtype=int) - first_year] = True
+        self.counts = self.matrix.sum(axis=0)
+
+    def max_overlap(self) -> int:
+        return int(self.counts.max()) if len(self.counts) else 0
+
+    def years_covered_by(self, min_datasets: int) -> List[int]:
+        return self.years[self.counts >= min_datasets].tolist()
+
+    def runs(self, min_datasets: int) -> List[Tuple[int, int]]:
+        covered = (self.counts >= min_datasets).astype(np.int8)
+        edges = np.diff(np.concatenate(([0], covered, [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1) - 1
+        return list(zip(self.years[starts].tolist(), self.years[ends].tolist()))
+
+    def longest_run(self, min_datasets: int) -> Optional[Tuple[int, int]]:
+        runs = self.runs(min_datasets)
+        if not runs:
+            return None
+        # argmax keeps the earliest of equally long runs
+        return runs[int(np.argmax([end - start for start, end in runs]))]
+
+    def overlapping(self, start: int, end: int) -> Dict[str, List[int]]:
+        in_period = (self.years >= start) & (self.years <= end)
+        window = self.matrix[:, in_period]
+        return {
+            self.datasets[row]: self.years[in_period][window[row]].tolist()
+            for row in np.flatnonzero(window.any(axis=1))
+        }
+
+
+class TimelineQueryStore:
+    MAX_CACHED_RESPONSES = 1024
+
+    def __init__(self, long_table: pd.DataFrame):
+        # rows sorted by entity then year, so a country is one contiguous block and a year range is a binary search;
+        # entities are kept apart even where two share a display name (Kosovo is both XKO and XKX)
+        if 'country_key' not in long_table:
+            long_table = long_table.assign(country_key=long_table['country'])
+        table = long_table.sort_values(['country_key', 'year'], kind='stable').reset_index(drop=True)
+        self.country_keys = [str(key) for key in table['country_key'].astype('category').cat.categories]
+        key_codes = table['country_key'].astype('category').cat.codes.to_numpy()
+        bounds = np.searchsorted(key_codes, np.arange(len(self.country_keys) + 1))
+        block_names = table['country'].astype(str).to_numpy()
+        self.country_blocks = {key: (str(block_names[start]) if stop > start else key, start, stop)
+                               for key, start, stop in zip(self.country_keys, bounds[:-1], bounds[1:])}
+
+        # a query names a country by entity key or display name; a name shared by several entities matches all of them
+        self.country_lookup = {}
+        for key, (name, _, _) in self.country_blocks.items():
+            self.country_lookup.setdefault(name.casefold(), []).append(key)
+        for key in self.country_blocks:
+            self.country_lookup[key.casefold()] = [key]
+
+        self.indicator_names = [str(name) for name in table['indicator'].astype('category').cat.categories]
+        self.dataset_names = [str(name) for name in table['dataset'].astype('category').cat.categories]
+        self.indicator_lookup = {name: code for code, name in enumerate(self.indicator_names)}
+        self.dataset_lookup = {name: code for code, name in enumerate(self.dataset_names)}
+        self.indicator_codes = table['indicator'].astype('category').cat.codes.to_numpy()
+        self.dataset_codes = table['dataset'].astype('category').cat.codes.to_numpy()
+        self.years = table['year'].to_numpy()
+        self.raw_values = table['raw_value'].to_numpy()
+        self.normalized_values = table['normalized_value'].to_numpy()
+        self.interpolated = table['interpolated'].to_numpy()
+
+        # encoded responses per query; the data never changes while the store is serving
+        self.responses = {}
+        self.responses_lock = threading.Lock()
+
+    def describe_countries(self) -> List[Dict[str, Any]]:
+        return [{'key': key, 'name': name, 'year_range': [int(self.years[start]), int(self.years[stop - 1])],
+                 'rows': int(stop - start)}
+                for key, (name, start, stop) in self.country_blocks.items() if stop > start]
+
+    def describe_indicators(self) -> List[Dict[str, Any]]:
+        pairs = np.unique(np.stack([self.indicator_codes, self.dataset_codes]), axis=1)
+        return [{'indicator': self.indicator_names[indicator], 'dataset': self.dataset_names[dataset]}
+                for indicator, dataset in pairs.T.tolist()]
+
+    def query(self, country: Optional[str] = None, start: Optional[int] = None, end: Optional[int] = None,
+              indicators: Optional[List[str]] = None, datasets: Optional[List[str]] = None) -> Dict[str, Any]:
+        if country is None:
+            keys = list(self.country_blocks)
+        elif country.casefold() in self.country_lookup:
+            keys = self.country_lookup[country.casefold()]
+            if len(keys) > 1:
+                raise ValueError(f"country {country} is ambiguous, use one of {', '.join(keys)}")
+        else:
+            raise KeyError(country)
+
+        result = {}
+        for key in keys:
+            name, block_start, block_stop = self.country_blocks[key]
+            block_years = self.years[block_start:block_stop]
+            lo = block_start + (np.searchsorted(block_years, start, 'left') if start is not None else 0)
+            hi = block_start + (np.searchsorted(block_years, end, 'right') if end is not None else len(block_years))
+
+            rows = np.arange(lo, hi)
+            if indicators is not None:
+                wanted = [self.indicator_lookup[key] for key in indicators if key in self.indicator_lookup]
+                rows = rows[np.isin(self.indicator_codes[rows], wanted)]
+            if datasets is not None:
+                wanted = [self.dataset_lookup[key] for key in datasets if key in self.dataset_lookup]
+                rows = rows[np.isin(self.dataset_codes[rows], wanted)]
+            if len(rows) == 0 and country is None:
+                continue
+
+            result[key] = {
+                'name': name,
+                'year': self.years[rows].tolist(),
+                'indicator': [self.indicator_names[code] for code in self.indicator_codes[rows].tolist()],
+                'dataset': [self.dataset_names[code] for code in self.dataset_codes[rows].tolist()],
+                'raw_value': [None if value != value else value for value in self.raw_values[rows].tolist()],
+                'normalized_value': [None if value != value else value
+                                     for value in self.normalized_values[rows].tolist()],
+                'interpolated': self.interpolated[rows].tolist()
+            }
+        return {'start': start, 'end': end, 'countries': result}
+
+    def response(self, path: str, params: Dict[str, List[str]]) -> Tuple[int, Dict[str, Any]]:
+        def single(name):
+            return params[name][-1] if name in params else None
+
+        def listed(name):
+            if name not in params:
+                return None
+            return [value for values in params[name] for value in values.split(',') if value]
+
+        if path == '/countries':
+            return 200, {'countries': self.describe_countries()}
+        if path == '/indicators':
+            return 200, {'indicators': self.describe_indicators()}
+        if path != '/query':
+            return 404, {'error': f"unknown path {path}"}
+
+        try:
+            start = int(single('start')) if single('start') is not None else None
+            end = int(single('end')) if single('end') is not None else None
+        except ValueError:
+            return 400, {'error': "start and end must be years"}
+        try:
+            return 200, self.query(single('country'), start, end, listed('indicator'), listed('dataset'))
+        except KeyError:
+            return 404, {'error': f"unknown country {single('country')}"}
+        except ValueError as e:
+            return 400, {'error': str(e)}
+
+    def encoded_response(self, path: str, params: Dict[str, List[str]]) -> Tuple[int, str, bytes, Optional[bytes]]:
+        cache_key = (path, tuple(sorted((name, tuple(values)) for name, values in params.items())))
+        with self.responses_lock:
+            cached = self.responses.get(cache_key)
+        if cached is not None:
+            return cached
+
+        status, payload = self.response(path, params)
+        body = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        etag = '"' + hashlib.sha256(body).hexdigest()[:20] + '"'
+        gzipped = gzip.compress(body, compresslevel=6, mtime=0) if len(body) >= 512 else None
+
+        encoded = (status, etag, body, gzipped)
+        with self.responses_lock:
+            if len(self.responses) >= self.MAX_CACHED_RESPONSES:
+                self.responses.pop(next(iter(self.responses)))
+            self.responses[cache_key] = encoded
+        return encoded
+
+
+class TimelineQueryHandler(BaseHTTPRequestHandler):
+    store = None
+    protocol_version = 'HTTP/1.1'
+    # headers and body go out in separate writes; with Nagle on, keep-alive clients wait out the delayed ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        status, etag, body, gzipped = self.store.encoded_response(url.path, parse_qs(url.query))
+
+        use_gzip = gzipped is not None and 'gzip' in self.headers.get('Accept-Encoding', '')
+        payload = gzipped if use_gzip else body
+        # each encoding is its own representation, so the gzip body gets its own validator
+        if use_gzip:
+            etag = etag[:-1] + '-gzip"'
+
+        if status == 200 and self.etag_matches(etag):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Vary', 'Accept-Encoding')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def etag_matches(self, etag: str) -> bool:
+        # If-None-Match is either * or a list of entity tags, compared weakly as RFC 9110 asks for GET
+        header = self.headers.get('If-None-Match')
+        if header is None:
+            return False
+        if header.strip() == '*':
+            return True
+        return etag in [tag.removeprefix('W/') for tag in re.findall(r'(?:W/)?"[^"]*"', header)]
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+def make_query_server(store: TimelineQueryStore, host: str = '127.0.0.1', port: int = 8765) -> ThreadingHTTPServer:
+    handler = type('BoundTimelineQueryHandler', (TimelineQueryHandler,), {'store': store})
+    return ThreadingHTTPServer((host, port), handler)
+
+
 class KoreaDemocracyDataIntegrator:
-    def __init__(self, dataset_root: str):
+    # part of every cache and build-manifest key; bump it whenever a change alters what extraction produces
+    EXTRACTION_VERSION = 2
+
+    def __init__(self, dataset_root: str, cache: Optional[ParsedFileCache] = None,
+                 load_mode: str = 'full', trace_memory: bool = False, gap_fill_method: str = 'linear',
+                 stream_memory_mb: int = 64, profiler: Optional[StageProfiler] = None,
+                 output_precision: Optional[int] = None):
         self.dataset_root = Path(dataset_root)
+        self.cache = cache
+        self.load_mode = load_mode
+        self.trace_memory = trace_memory
+        self.gap_fill_method = gap_fill_method
+        self.stream_memory_mb = stream_memory_mb
+        self.profiler = profiler or StageProfiler()
+        self.output_precision = output_precision
+        self.dialect_manifest = DialectManifest(self.dataset_root / '.dialects.json')
         self.korea_data = {}
         self.integrated_timeline = {}
         self.web_data = {}
 
-        self.korea_patterns = [
-            'kor', 'kr', 'rok', '410', '732',
-            'south korea', 'korea', 'republic of korea', 'korea, south', 
-            'korea (south)', 's. korea', 's korea', 'korean',
-            'corée du sud', 'corée', 'coree du sud', 'coree',
-            'corea del sur', 'corea',
-            'coreia do sul', 'coreia',
-            'korea south', 'south-korea'
+        self.target_country = 'KOR'
+        self.target_country_names = [
+            'South Korea', 'Korea, South', 'Republic of Korea', 'Korea (South)',
+            'Corée du Sud', 'Corea del Sur', 'Coreia do Sul'
         ]
+        self.country_index = None
+        self.indicator_schemas = {}
+
+        self.country_column_keywords = ['country', 'nation', 'state', 'iso', 'code', 'name', 'territory']
+        self.country_name_columns = ['country', 'country_name', 'en_country', 'country_en']
+        self.multilingual_column_prefixes = ['en_', 'fr_', 'es_', 'ar_', 'fa_', 'pt_']
 
         self.democracy_indicators = {
             'pr': {'name': 'Political Rights', 'scale_range': (1, 7), 'reverse': True},
@@ -54,6 +817,10 @@ class KoreaDemocracyDataIntegrator:
             'democracy', 'democratic', 'freedom', 'liberty', 'civil', 'political', 'rights'
         ]
 
+        self.numeric_indicator_keywords = [
+            'score', 'index', 'rating', 'rank', 'freedom', 'democracy', 'political', 'civil'
+        ]
+
     def detect_delimiter(self, file_path: Path) -> str:
         try:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
@@ -64,26 +831,11 @@ class KoreaDemocracyDataIntegrator:
         except:
             return ','
 
-    def safe_read_csv(self, file_path: Path) -> Optional[pd.DataFrame]:
-        encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1', 'utf-8-sig']
-
+    def read_csv_with_retries(self, file_path: Path) -> Tuple[Optional[pd.DataFrame], Optional[Dict[str, Any]]]:
         delimiter = self.detect_delimiter(file_path)
 
-        for encoding in encodings:
-            try:
-                df = pd.read_csv(file_path, 
-                               encoding=encoding, 
-                               delimiter=delimiter,
-                               low_memory=False,
-                               on_bad_lines='skip')
-                
-                if len(df) > 0 and len(df.columns) > 1:
-                    return df
-            except Exception:
-                continue
-
-        for delimiter in [';', ',', '\t', '|']:
-            for encoding in encodings:
+        for delimiter in [delimiter] + [d for d in CSV_DELIMITERS if d != delimiter]:
+            for encoding in CSV_ENCODINGS:
                 try:
                     df = pd.read_csv(file_path, 
                                    encoding=encoding,
@@ -91,108 +843,517 @@ class KoreaDemocracyDataIntegrator:
                                    low_memory=False,
                                    on_bad_lines='skip')
                     if len(df) > 0 and len(df.columns) > 1:
-                        return df
+                        return df, {'encoding': encoding, 'delimiter': delimiter, 'decimal': '.', 'header': 0}
                 except Exception:
                     continue
         
-        return None
+        return None, None
 
-    def find_korea_data(self, df: pd.DataFrame) -> Tuple[List[int], List[str]]:
-        korea_rows = []
-        korea_columns = []
-        
-        for col in df.columns:
-            if df[col].dtype == 'object':
-                col_values = df[col].astype(str).str.lower().fillna('')
-                
-                for pattern in self.korea_patterns:
-                    mask = col_values.str.contains(pattern, na=False, regex=False)
-                    if mask.any():
-                        korea_rows.extend(df[mask].index.tolist())
-                        if col not in korea_columns:
-                            korea_columns.append(col)
-        
-        return list(set(korea_rows)), korea_columns
+    def safe_read_csv(self, file_path: Path) -> Optional[pd.DataFrame]:
+        dialect = self.dialect_manifest.resolve(file_path)
+
+        try:
+            df = read_csv_with_dialect(file_path, dialect)
+            if len(df) > 0 and len(df.columns) > 1:
+                return df
+        except Exception:
+            pass
 
-    def extract_year_from_data(self, df: pd.DataFrame, korea_rows: List[int]) -> List[int]:
-        years = []
+        df, dialect = self.read_csv_with_retries(file_path)
+        if dialect is not None:
+            self.dialect_manifest.record(file_path, dialect)
+        return df
 
-        year_columns = []
+    def is_indicator_candidate(self, col) -> bool:
+        col_lower = str(col).lower()
+        return (any(col_lower == key or col_lower.endswith(key) for key in self.democracy_indicators) or
+                any(keyword in col_lower for keyword in self.generic_democracy_keywords) or
+                any(keyword in col_lower for keyword in self.numeric_indicator_keywords))
+
+    def select_columns(self, header: List[str]) -> Optional[List[str]]:
+        year_columns = [col for col in header if any(term in str(col).lower() for term in ['year', 'time', 'date'])]
+        if not year_columns:
+            # without a year column, years are searched for across every column of the row
+            return None
+
+        return [col for col in header
+                if col in year_columns or self.is_country_column(col) or self.is_indicator_candidate(col)]
+
+    def compact_dtypes(self, df: pd.DataFrame) -> pd.DataFrame:
+        dtypes = {}
         for col in df.columns:
-            col_lower = str(col).lower()
-            if any(term in col_lower for term in ['year', 'time', 'date']):
-                year_columns.append(col)
+            dtype = df[col].dtype
+            if dtype == 'object' and self.is_country_column(col):
+                dtypes[col] = 'category'
+            elif pd.api.types.is_integer_dtype(dtype) and len(df):
+                min_val, max_val = df[col].min(), df[col].max()
+                dtypes[col] = next(candidate for candidate in (np.int8, np.int16, np.int32, np.int64)
+                                   if np.iinfo(candidate).min <= min_val and max_val <= np.iinfo(candidate).max)
+            elif pd.api.types.is_float_dtype(dtype) and self.float32_round_trips(df[col]):
+                dtypes[col] = np.float32
+        return df.astype(dtypes)
 
-        for row_idx in korea_rows:
-            for year_col in year_columns:
-                try:
-                    year_val = df.iloc[row_idx][year_col]
-                    if pd.notna(year_val):
-                        year_str = str(year_val)
-                        year_match = re.search(r'(19|20)\d{2}', year_str)
-                        if year_match:
-                            years.append(int(year_match.group()))
-                            break
-                except:
+    def float32_round_trips(self, values: pd.Series) -> bool:
+        # only narrow columns that widen_float32 hands back unchanged; scores carried to
+        # eight or more significant digits (RSF's 15.66666667) stay float64
+        widened = widen_float32(values.astype(np.float32)).to_numpy(dtype=float)
+        return np.array_equal(widened, values.to_numpy(dtype=float), equal_nan=True)
+
+    def read_projected_csv(self, file_path: Path) -> Tuple[Optional[pd.DataFrame], int]:
+        dialect = self.dialect_manifest.resolve(file_path)
+
+        try:
+            header = list(read_csv_with_dialect(file_path, dialect, nrows=0).columns)
+            usecols = self.select_columns(header)
+            df = read_csv_with_dialect(file_path, dialect, usecols=usecols)
+            if len(df) == 0 or len(df.columns) <= 1:
+                raise ValueError("projected read returned no usable columns")
+        except Exception:
+            df = self.safe_read_csv(file_path)
+            header = list(df.columns) if df is not None else []
+
+        if df is None:
+            return None, 0
+        return self.compact_dtypes(df), len(header)
+
+    def stream_chunk_rows(self, file_path: Path, dialect: Dict[str, Any]) -> int:
+        sample = read_csv_with_dialect(file_path, dialect, nrows=1000)
+        bytes_per_row = max(1.0, sample.memory_usage(deep=True).sum() / max(len(sample), 1))
+        # a quarter of the ceiling for the parsed chunk leaves room for parser buffers and kept rows
+        return max(100, int(self.stream_memory_mb * 1024 * 1024 / 4 / bytes_per_row))
+
+    def stream_row_mask(self, chunk: pd.DataFrame, all_countries: bool) -> np.ndarray:
+        # any country-like column resolving to the target keeps the row, whatever its dtype in this
+        # chunk; this is a superset of the rows the exact resolution picks on the merged frame
+        keep = np.zeros(len(chunk), dtype=bool)
+        for col in chunk.columns:
+            if not self.is_country_column(col):
+                continue
+            entities = self.resolve_column_entities(chunk[col], CountryEntityIndex.column_kind(col), self.country_index)
+            keep |= pd.notna(entities) if all_countries else entities == self.target_country
+        return keep
+
+    @staticmethod
+    def chunk_column_kind(values: pd.Series) -> str:
+        if values.isna().all():
+            return 'empty'
+        if pd.api.types.is_bool_dtype(values):
+            return 'bool'
+        if pd.api.types.is_integer_dtype(values):
+            return 'int'
+        if pd.api.types.is_float_dtype(values):
+            return 'float'
+        return 'bool' if pd.api.types.infer_dtype(values, skipna=True) == 'boolean' else 'str'
+
+    @staticmethod
+    def unify_column_kinds(kinds: set, has_missing: bool) -> str:
+        # mirrors how a single whole-file read infers a column from all of its values
+        present = kinds - {'empty'}
+        if not present or present <= {'int', 'float'}:
+            return 'int' if present == {'int'} and not has_missing else 'float'
+        if present == {'bool'}:
+            return 'object' if has_missing else 'bool'
+        return 'str'
+
+    def read_streaming_csv(self, file_path: Path,
+                           all_countries: bool = False) -> Tuple[Optional[pd.DataFrame], Dict[str, Any]]:
+        dialect = self.dialect_manifest.resolve(file_path)
+        if self.country_index is None:
+            self.build_country_index()
+
+        chunk_rows = self.stream_chunk_rows(file_path, dialect)
+        limit_bytes = self.stream_memory_mb * 1024 * 1024
+        peak_rss = current_rss_bytes()
+
+        def stream(dtype=None):
+            nonlocal peak_rss
+            offset = 0
+            for chunk in read_csv_with_dialect(file_path, dialect, chunksize=chunk_rows, dtype=dtype):
+                rss = current_rss_bytes()
+                if rss is not None:
+                    peak_rss = max(peak_rss or 0, rss)
+                yield offset, chunk
+                offset += len(chunk)
+
+        kinds, missing, stats, pieces, positions = {}, {}, {}, [], []
+        kept_bytes, chunks = 0, 0
+        stat_columns = None
+        for offset, chunk in stream():
+            chunks += 1
+            if stat_columns is None:
+                stat_columns = [col for col in chunk.columns
+                                if any(keyword in str(col).lower() for keyword in self.numeric_indicator_keywords)]
+            for col in chunk.columns:
+                kinds.setdefault(col, set()).add(self.chunk_column_kind(chunk[col]))
+                missing[col] = missing.get(col, False) or bool(chunk[col].isna().any())
+            for col in stat_columns:
+                values = chunk[col]
+                if not (pd.api.types.is_integer_dtype(values) or pd.api.types.is_float_dtype(values)):
                     continue
+                col_stats = stats.setdefault(col, {'min': [], 'max': [], 'uniques': set()})
+                col_stats['min'].append(values.min())
+                col_stats['max'].append(values.max())
+                if len(col_stats['uniques']) < 200:
+                    col_stats['uniques'].update(values.dropna().unique().tolist())
 
-            if not years or len(years) == len([y for y in years if y != years[-1]]):
-                for col in df.columns:
-                    try:
-                        val = df.iloc[row_idx][col]
-                        if pd.notna(val):
-                            val_str = str(val)
-                            if re.match(r'^(19|20)\d{2}$', val_str):
-                                years.append(int(val_str))
-                                break
-                    except:
+            rows = np.flatnonzero(self.stream_row_mask(chunk, all_countries))
+            if len(rows):
+                kept = chunk.iloc[rows]
+                kept_bytes += int(kept.memory_usage(deep=True).sum())
+                if kept_bytes > limit_bytes:
+                    raise MemoryError(f"rows kept from {file_path.name} exceed the "
+                                      f"{self.stream_memory_mb} MB streaming limit")
+                pieces.append(kept)
+                positions.append(rows + offset)
+
+        if chunks == 0:
+            raise ValueError("streaming read returned no chunks")
+
+        unified = {col: self.unify_column_kinds(col_kinds, missing[col]) for col, col_kinds in kinds.items()}
+
+        # a column that is text anywhere in the file must keep the original text of numeric-looking
+        # rows too, so those columns are streamed once more as strings for the kept positions
+        text_columns = [col for col, kind in unified.items() if kind == 'str'
+                        and any(piece[col].dtype != object and piece[col].notna().any() for piece in pieces)]
+        if text_columns and pieces:
+            kept_positions = np.concatenate(positions)
+            pieces = []
+            for offset, chunk in stream(dtype={col: object for col in text_columns}):
+                local = kept_positions[(kept_positions >= offset) & (kept_positions < offset + len(chunk))] - offset
+                if len(local):
+                    pieces.append(chunk.iloc[local])
+
+        columns = list(kinds)
+        if pieces:
+            df = pd.concat(pieces)
+        else:
+            df = pd.DataFrame({col: pd.Series(dtype=object) for col in columns})
+        df = df.astype({col: {'int': np.int64, 'float': np.float64, 'bool': bool}.get(kind, object)
+                        for col, kind in unified.items()})
+        df = df.reset_index(drop=True)
+
+        column_stats = {}
+        for col, col_stats in stats.items():
+            if unified[col] not in ('int', 'float'):
+                continue
+            cast = np.int64 if unified[col] == 'int' else np.float64
+            mins = [value for value in col_stats['min'] if not pd.isna(value)]
+            maxs = [value for value in col_stats['max'] if not pd.isna(value)]
+            column_stats[col] = (cast(min(mins)) if mins else np.nan,
+                                 cast(max(maxs)) if maxs else np.nan,
+                                 min(len(col_stats['uniques']), 200))
+
+        rss = current_rss_bytes()
+        if rss is not None:
+            peak_rss = max(peak_rss or 0, rss)
+
+        return df, {
+            'columns_total': len(columns),
+            'chunks': chunks,
+            'chunk_rows': chunk_rows,
+            'rows_kept': len(df),
+            'peak_rss_bytes': peak_rss,
+            'column_stats': column_stats
+        }
+
+    def load_csv(self, file_path: Path, all_countries: bool = False) -> Tuple[Optional[pd.DataFrame], Dict[str, Any]]:
+        tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        start = time.perf_counter()
+        stream_stats = {}
+
+        try:
+            if self.load_mode == 'projected':
+                df, columns_total = self.read_projected_csv(file_path)
+            elif self.load_mode == 'stream':
+                try:
+                    df, stream_stats = self.read_streaming_csv(file_path, all_countries)
+                except MemoryError:
+                    raise
+                except Exception:
+                    df = self.safe_read_csv(file_path)
+                columns_total = stream_stats.get('columns_total', len(df.columns) if df is not None else 0)
+            else:
+                df = self.safe_read_csv(file_path)
+                columns_total = len(df.columns) if df is not None else 0
+        finally:
+            parse_seconds = time.perf_counter() - start
+            peak_bytes = None
+            if tracing:
+                peak_bytes = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+        load_stats = {
+            'load_mode': self.load_mode,
+            'parse_seconds': parse_seconds,
+            'columns_total': columns_total,
+            'columns_loaded': len(df.columns) if df is not None else 0,
+            'frame_bytes': int(df.memory_usage(deep=True).sum()) if df is not None else 0,
+            'peak_bytes': peak_bytes
+        }
+        if stream_stats:
+            load_stats.update({key: stream_stats[key] for key in
+                               ['chunks', 'chunk_rows', 'rows_kept', 'peak_rss_bytes', 'column_stats']})
+        return df, load_stats
+
+    def is_country_column(self, col) -> bool:
+        col_lower = str(col).lower()
+        return (any(keyword in col_lower for keyword in self.country_column_keywords) or
+                any(prefix in col_lower for prefix in self.multilingual_column_prefixes))
+
+    def country_columns(self, df: pd.DataFrame) -> List[str]:
+        columns = []
+        for col in df.columns:
+            if not self.is_country_column(col):
+                continue
+            kind = CountryEntityIndex.column_kind(col)
+            is_text = df[col].dtype == 'object' or isinstance(df[col].dtype, pd.CategoricalDtype)
+            if is_text or (kind.startswith('code:') and pd.api.types.is_integer_dtype(df[col])):
+                columns.append(col)
+
+        # ISO columns decide first, then dataset-specific codes, then names
+        priority = {'iso': 0, 'name': 2}
+        return sorted(columns, key=lambda col: priority.get(CountryEntityIndex.column_kind(col), 1))
+
+    def country_alias_keys(self, values: pd.Series, kind: str) -> np.ndarray:
+        return map_unique_values(values, lambda value: CountryEntityIndex.alias_key(kind, value))
+
+    def resolve_column_entities(self, values: pd.Series, kind: str, country_index: CountryEntityIndex) -> np.ndarray:
+        return map_unique_values(values, lambda value: country_index.resolve(CountryEntityIndex.alias_key(kind, value)))
+
+    def collect_country_aliases(self, df: pd.DataFrame) -> List[Tuple[Tuple[str, ...], Optional[str]]]:
+        columns = self.country_columns(df)
+        if not columns:
+            return []
+
+        alias_frame = pd.DataFrame({
+            col: self.country_alias_keys(df[col], CountryEntityIndex.column_kind(col)) for col in columns
+        })
+        display_columns = [col for preferred in self.country_name_columns
+                           for col in columns if str(col).strip().lower() == preferred]
+        if display_columns:
+            alias_frame['display_name'] = df[display_columns[0]].astype(str).str.strip().to_numpy()
+        else:
+            alias_frame['display_name'] = None
+
+        alias_rows = []
+        for row in alias_frame.drop_duplicates(subset=columns).itertuples(index=False):
+            keys = tuple(key for key in row[:-1] if key is not None)
+            if keys:
+                alias_rows.append((keys, row[-1]))
+        return alias_rows
+
+    def read_country_aliases(self, csv_file: Path) -> List[Tuple[Tuple[str, ...], Optional[str]]]:
+        dialect = self.dialect_manifest.resolve(csv_file)
+        try:
+            header = read_csv_with_dialect(csv_file, dialect, nrows=0)
+            usecols = [col for col in header.columns if self.is_country_column(col)]
+            if not usecols:
+                return []
+            df = read_csv_with_dialect(csv_file, dialect, usecols=usecols)
+        except Exception:
+            df = self.safe_read_csv(csv_file)
+            if df is None:
+                return []
+        return self.collect_country_aliases(df)
+
+    def file_country_aliases(self, csv_file: Path) -> List[Tuple[Tuple[str, ...], Optional[str]]]:
+        if self.cache is None:
+            return self.read_country_aliases(csv_file)
+        cache_key = self.cache.file_key(csv_file, {'country_aliases': self.country_column_keywords,
+                                                   'extraction_version': self.EXTRACTION_VERSION})
+        file_aliases = self.cache.get(cache_key)
+        if file_aliases is None:
+            file_aliases = self.read_country_aliases(csv_file)
+            self.cache.put(cache_key, file_aliases)
+        return file_aliases
+
+    def build_country_index(self, known_aliases: Optional[Dict[Path, List]] = None) -> CountryEntityIndex:
+        # known_aliases supplies rows for files that need not be read again and collects the rows read now
+        with self.profiler.stage('country_index') as stage:
+            alias_rows = []
+            for dataset_name in self.list_dataset_names():
+                for csv_file in self.list_dataset_files(dataset_name):
+                    if known_aliases is None:
+                        alias_rows.extend(self.file_country_aliases(csv_file))
                         continue
-        
-        return sorted(list(set(years)))
+                    if csv_file not in known_aliases:
+                        known_aliases[csv_file] = self.file_country_aliases(csv_file)
+                    alias_rows.extend(known_aliases[csv_file])
+
+            self.country_index = CountryEntityIndex().build(
+                alias_rows, seeds={self.target_country: self.target_country_names}
+            )
+            stage['rows_in'] = len(alias_rows)
+            stage['rows_out'] = len(self.country_index.aliases)
+        return self.country_index
+
+    def resolve_row_entities(self, df: pd.DataFrame) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        country_index = self.country_index
+        if country_index is None:
+            # standalone frames without a dataset-wide index resolve against their own rows
+            country_index = CountryEntityIndex().build(
+                self.collect_country_aliases(df), seeds={self.target_country: self.target_country_names}
+            )
+
+        entities = np.full(len(df), None, dtype=object)
+        column_entities = {}
+        for col in self.country_columns(df):
+            column_entities[col] = self.resolve_column_entities(df[col], CountryEntityIndex.column_kind(col),
+                                                                country_index)
+            pending = pd.isna(entities)
+            entities[pending] = column_entities[col][pending]
+
+        return entities, column_entities
+
+    def find_korea_data(self, df: pd.DataFrame) -> Tuple[np.ndarray, List[str]]:
+        entities, column_entities = self.resolve_row_entities(df)
+        korea_columns = [col for col, values in column_entities.items() if (values == self.target_country).any()]
+        return np.flatnonzero(entities == self.target_country), korea_columns
+
+    def resolve_country_keys(self, df: pd.DataFrame) -> Tuple[np.ndarray, Dict[str, str], List[str]]:
+        entities, column_entities = self.resolve_row_entities(df)
+        country_index = self.country_index or CountryEntityIndex()
+        country_names = {entity: country_index.display_name(entity)
+                         for entity in pd.unique(entities[pd.notna(entities)])}
+        return entities, country_names, list(column_entities)
+
+    def detect_year_columns(self, df: pd.DataFrame) -> List[str]:
+        return [col for col in df.columns
+                if any(term in str(col).lower() for term in ['year', 'time', 'date'])]
+
+    def match_years(self, values: pd.Series, full_match: bool = False) -> np.ndarray:
+        pattern = re.compile(r'^(19|20)\d{2}$' if full_match else r'(19|20)\d{2}')
+        matcher = pattern.match if full_match else pattern.search
+
+        def year_of(value):
+            year_match = matcher(str(value))
+            return int(year_match.group()) if year_match else np.nan
+        return map_unique_values(values, year_of, missing=np.nan, dtype=float)
+
+    def resolve_row_years(self, df: pd.DataFrame, korea_rows: np.ndarray) -> np.ndarray:
+        rows = df.iloc[korea_rows]
+        row_years = np.full(len(rows), np.nan)
+
+        for year_col in self.detect_year_columns(df):
+            pending = np.flatnonzero(np.isnan(row_years))
+            if len(pending) == 0:
+                break
+            row_years[pending] = self.match_years(rows[year_col].iloc[pending])
 
-    def identify_democracy_indicators(self, df: pd.DataFrame) -> Dict[str, Dict]:
-        indicators = {}
-        
         for col in df.columns:
-            col_lower = col.lower()
-
-            for indicator_key, indicator_info in self.democracy_indicators.items():
-                if col_lower == indicator_key or col_lower.endswith(indicator_key):
-                    indicators[col] = indicator_info.copy()
-                    indicators[col]['original_column'] = col
-                    break
-
-            if col not in indicators:
-                for keyword in self.generic_democracy_keywords:
-                    if keyword in col_lower:
-                        indicators[col] = {
-                            'name': col,
-                            'scale_range': None,
-                            'reverse': False,
-                            'original_column': col
-                        }
-                        break
-
-            if col not in indicators and df[col].dtype in ['int64', 'float64']:
-                try:
-                    min_val = df[col].min()
-                    max_val = df[col].max()
-                    unique_count = df[col].nunique()
-
-                    if unique_count < 200 and not pd.isna(min_val) and not pd.isna(max_val):
-                        democracy_keywords = ['score', 'index', 'rating', 'rank', 'freedom', 'democracy', 'political', 'civil']
-                        if any(keyword in col_lower for keyword in democracy_keywords):
-                            indicators[col] = {
-                                'name': col,
-                                'scale_range': (min_val, max_val),
-                                'reverse': 'rank' in col_lower,
-                                'original_column': col
-                            }
-                except:
-                    continue
-        
+            pending = np.flatnonzero(np.isnan(row_years))
+            if len(pending) == 0:
+                break
+            row_years[pending] = self.match_years(rows[col].iloc[pending], full_match=True)
+
+        return row_years
+
+    def extract_year_from_data(self, df: pd.DataFrame, korea_rows: np.ndarray) -> List[int]:
+        row_years = self.resolve_row_years(df, korea_rows)
+        return sorted(int(year) for year in np.unique(row_years[~np.isnan(row_years)]))
+
+    def match_indicator_column(self, df: pd.DataFrame, col) -> Any:
+        col_lower = str(col).lower()
+
+        for indicator_key, indicator_info in self.democracy_indicators.items():
+            if col_lower == indicator_key or col_lower.endswith(indicator_key):
+                return dict(indicator_info, original_column=col)
+
+        for keyword in self.generic_democracy_keywords:
+            if keyword in col_lower:
+                return {'name': col, 'scale_range': None, 'reverse': False, 'original_column': col}
+
+        # numeric columns named like a score take their scale from the data
+        if ((pd.api.types.is_integer_dtype(df[col]) or pd.api.types.is_float_dtype(df[col])) and
+                any(keyword in col_lower for keyword in self.numeric_indicator_keywords)):
+            return 'range'
+        return None
+
+    def identify_democracy_indicators(self, df: pd.DataFrame,
+                                      column_stats: Optional[Dict[str, Tuple]] = None) -> Dict[str, Dict]:
+        # header layouts repeat across files (the RSF years share two), so column names and dtypes are classified
+        # once per layout. Only that part is cached: whether a numeric column is a scale, and its range, depend on
+        # the file's values, and a decision cached from one file would make the result depend on file order.
+        signature = tuple((str(col), str(dtype)) for col, dtype in df.dtypes.items())
+        schema = self.indicator_schemas.get(signature)
+        if schema is None:
+            schema = {col: self.match_indicator_column(df, col) for col in df.columns}
+            self.indicator_schemas[signature] = schema
+
+        indicators = {}
+        for col, matched in schema.items():
+            if matched is None:
+                continue
+            if matched != 'range':
+                indicators[col] = dict(matched)
+                continue
+
+            try:
+                if column_stats is not None and col in column_stats:
+                    # streamed files only keep the target rows, so ranges come from the whole-file pass
+                    min_val, max_val, unique_count = column_stats[col]
+                else:
+                    # the distinct-value test rejects most such columns, so the range is only taken for the rest
+                    values = widen_float32(df[col])
+                    unique_count = values.nunique()
+                    if unique_count >= 200:
+                        continue
+                    min_val = values.min()
+                    max_val = values.max()
+            except Exception:
+                continue
+
+            if unique_count >= 200:
+                continue
+            if pd.isna(min_val) or pd.isna(max_val):
+                continue
+            indicators[col] = {
+                'name': col,
+                'scale_range': (min_val, max_val),
+                'reverse': 'rank' in str(col).lower(),
+                'original_column': col
+            }
         return indicators
 
+    def build_scale_table(self, indicators: Optional[Dict[str, Dict]] = None) -> pd.DataFrame:
+        if indicators is None:
+            indicators = self.democracy_indicators
+
+        rows = {}
+        for indicator_col, indicator_info in indicators.items():
+            scale_range = indicator_info.get('scale_range')
+            if scale_range:
+                rows[indicator_col] = (float(scale_range[0]), float(scale_range[1]),
+                                       bool(indicator_info.get('reverse', False)))
+            else:
+                rows[indicator_col] = (np.nan, np.nan, False)
+
+        return pd.DataFrame.from_dict(rows, orient='index', columns=['scale_min', 'scale_max', 'reverse'])
+
+    def normalize_array(self, values, scale_min, scale_max, reverse) -> np.ndarray:
+        values = np.asarray(values, dtype=float)
+        scale_min = np.broadcast_to(np.asarray(scale_min, dtype=float), values.shape)
+        scale_max = np.broadcast_to(np.asarray(scale_max, dtype=float), values.shape)
+        reverse = np.broadcast_to(np.asarray(reverse, dtype=bool), values.shape)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            normalized = (values - scale_min) / (scale_max - scale_min)
+        normalized = np.where(reverse, 1 - normalized, normalized)
+        scaled = np.where(scale_min == scale_max, 0.0, np.clip((normalized - 0.5) * 20, -10, 10))
+
+        # indicators without a declared range: 0-1 shares, 0-100 scores, anything else as-is
+        unscaled = np.select(
+            [(values >= 0) & (values <= 1), (values >= 0) & (values <= 100)],
+            [(values - 0.5) * 20, ((values / 100) - 0.5) * 20],
+            default=values
+        )
+
+        result = np.where(np.isnan(scale_min), unscaled, scaled)
+        result[np.isnan(values)] = np.nan
+        return result
+
     def normalize_to_democracy_scale(self, value: float, scale_range: Tuple[float, float], 
                                    reverse: bool = False) -> float:
         if pd.isna(value):
@@ -212,183 +1373,675 @@ class KoreaDemocracyDataIntegrator:
 
         return max(-10, min(10, democracy_score))
 
-    def process_dataset(self, dataset_name: str) -> Dict[str, Any]:
+    def extract_long_frame(self, df: pd.DataFrame, korea_rows: np.ndarray, indicators: Dict[str, Dict],
+                           country_keys: Optional[np.ndarray] = None) -> pd.DataFrame:
+        row_years = self.resolve_row_years(df, korea_rows)
+        has_year = ~np.isnan(row_years)
+        rows = df.iloc[korea_rows[has_year]]
+
+        # integer columns never reached the time series in the row-wise loop, which only
+        # accepted Python int/float values; float columns and loose object values did
+        value_columns = [col for col in indicators
+                         if pd.api.types.is_float_dtype(rows[col]) or rows[col].dtype == 'object']
+
+        values = rows[value_columns].apply(widen_float32).assign(year=row_years[has_year].astype(int))
+        id_vars = ['year']
+        if country_keys is not None:
+            values['country'] = country_keys[korea_rows[has_year]]
+            id_vars.append('country')
+        long_frame = values.melt(
+            id_vars=id_vars, value_vars=value_columns, var_name='indicator', value_name='raw_value'
+        )
+        if long_frame['raw_value'].dtype == 'object':
+            keep = long_frame['raw_value'].map(lambda value: isinstance(value, (int, float)) and pd.notna(value))
+        else:
+            keep = long_frame['raw_value'].notna()
+        long_frame = long_frame[keep.to_numpy(dtype=bool)]
+
+        scales = self.build_scale_table(indicators).reindex(long_frame['indicator'])
+        long_frame['normalized_value'] = self.normalize_array(
+            long_frame['raw_value'].to_numpy(dtype=float),
+            scales['scale_min'].to_numpy(),
+            scales['scale_max'].to_numpy(),
+            scales['reverse'].to_numpy(dtype=bool)
+        )
+        # the scalar path clamped with max(-10, min(10, score)), which hands back the int bound
+        clamped = scales['scale_min'].notna().to_numpy() & (long_frame['normalized_value'].abs() == 10).to_numpy()
+        if clamped.any():
+            normalized = long_frame['normalized_value'].astype(object).to_numpy()
+            normalized[clamped] = [10 if value > 0 else -10 for value in normalized[clamped]]
+            long_frame['normalized_value'] = normalized
+        return long_frame
+
+    def add_series_points(self, time_series_data: Dict[str, Any], indicator_col: str, points,
+                          indicators: Dict[str, Dict], dataset_name: str):
+        indicator_key = f"{dataset_name}_{indicator_col}"
+        if indicator_key not in time_series_data:
+            time_series_data[indicator_key] = {
+                'name': indicators[indicator_col]['name'],
+                'dataset': dataset_name,
+                'original_column': indicator_col,
+                'data': {}
+            }
+
+        series_data = time_series_data[indicator_key]['data']
+        for year, raw_value, normalized_value in points:
+            series_data[year] = {
+                'raw_value': raw_value,
+                'normalized_value': normalized_value
+            }
+
+    def merge_long_frame(self, time_series_data: Dict[str, Any], long_frame: pd.DataFrame,
+                         indicators: Dict[str, Dict], dataset_name: str):
+        for indicator_col, group in long_frame.groupby('indicator', sort=False):
+            points = zip(group['year'].tolist(), group['raw_value'].tolist(), group['normalized_value'].tolist())
+            self.add_series_points(time_series_data, indicator_col, points, indicators, dataset_name)
+
+    def merge_country_long_frame(self, country_series: Dict[str, Dict[str, Any]], long_frame: pd.DataFrame,
+                                 indicators: Dict[str, Dict], dataset_name: str):
+        # thousands of small (country, indicator) groups: collecting them in one pass beats a pandas groupby
+        groups = {}
+        for country_key, indicator_col, year, raw_value, normalized_value in zip(
+                long_frame['country'].tolist(), long_frame['indicator'].tolist(), long_frame['year'].tolist(),
+                long_frame['raw_value'].tolist(), long_frame['normalized_value'].tolist()):
+            groups.setdefault((country_key, indicator_col), []).append((year, raw_value, normalized_value))
+
+        for (country_key, indicator_col), points in groups.items():
+            self.add_series_points(country_series.setdefault(country_key, {}), indicator_col, points,
+                                   indicators, dataset_name)
+
+    def list_dataset_files(self, dataset_name: str) -> List[Path]:
+        csv_files = []
+        for root, dirs, files in os.walk(self.dataset_root / dataset_name):
+            for file in files:
+                if file.endswith('.csv') and not file.endswith('.sample'):
+                    csv_files.append(Path(root) / file)
+        return sorted(csv_files)
+
+    def extraction_settings(self) -> Dict[str, Any]:
+        return {
+            'extraction_version': self.EXTRACTION_VERSION,
+            'target_country': self.target_country,
+            'target_country_names': self.target_country_names,
+            'country_index': self.country_index.signature() if self.country_index else None,
+            'country_column_keywords': self.country_column_keywords,
+            'multilingual_column_prefixes': self.multilingual_column_prefixes,
+            'democracy_indicators': self.democracy_indicators,
+            'generic_democracy_keywords': self.generic_democracy_keywords,
+            'numeric_indicator_keywords': self.numeric_indicator_keywords,
+            'reader': 'dialect-manifest',
+            'load_mode': self.load_mode
+        }
+
+    def extract_file(self, csv_file: Path, all_countries: bool = False) -> Dict[str, Any]:
+        if self.load_mode == 'stream' and self.country_index is None:
+            self.build_country_index()
+
+        first_record = len(self.profiler.records)
+        with self.profiler.stage('file', csv_file) as stage:
+            if self.cache is None:
+                file_result = self.read_and_extract_file(csv_file, all_countries)
+            else:
+                cache_key = self.cache.file_key(csv_file,
+                                                dict(self.extraction_settings(), all_countries=all_countries))
+                file_result = self.cache.get(cache_key)
+                if file_result is not None:
+                    # entries are keyed by content, so the same bytes may have been cached under another path
+                    file_result.update({
+                        'file_name': csv_file.name,
+                        'file_path': str(csv_file),
+                        'dialect': self.dialect_manifest.lookup(csv_file) or file_result['dialect'],
+                        'cached': True
+                    })
+                else:
+                    file_result = self.read_and_extract_file(csv_file, all_countries)
+                    if not file_result['error']:
+                        self.cache.put(cache_key, {key: value for key, value in file_result.items()
+                                                   if key not in ('file_name', 'file_path')})
+            stage['rows_out'] = file_result['korea_rows']
+
+        # a worker's records only reach the parent through the result it returns
+        file_result['profile'] = self.profiler.records[first_record:]
+        return file_result
+
+    def read_and_extract_file(self, csv_file: Path, all_countries: bool = False) -> Dict[str, Any]:
+        file_result = {
+            'file_name': csv_file.name,
+            'file_path': str(csv_file),
+            'dialect': None,
+            'readable': False,
+            'korea_rows': 0,
+            'korea_columns': [],
+            'years': [],
+            'indicators': {},
+            'long_frame': None,
+            'country_names': {},
+            'country_years': {},
+            'load_stats': None,
+            'cached': False,
+            'error': None
+        }
+
+        try:
+            with self.profiler.stage('read', csv_file) as stage:
+                df, file_result['load_stats'] = self.load_csv(csv_file, all_countries)
+                stage['rows_out'] = len(df) if df is not None else 0
+            if file_result['load_stats']['peak_bytes'] is None:
+                # with --trace-memory the profiler is already tracing, so the loader peak is the read stage's
+                file_result['load_stats']['peak_bytes'] = stage['peak_bytes']
+            column_stats = file_result['load_stats'].pop('column_stats', None)
+            if df is None:
+                return file_result
+            file_result['readable'] = True
+            file_result['dialect'] = self.dialect_manifest.lookup(csv_file)
+
+            if all_countries:
+                return self.extract_all_countries(df, file_result, column_stats, csv_file)
+
+            with self.profiler.stage('match', csv_file, rows_in=len(df)) as stage:
+                korea_rows, korea_columns = self.find_korea_data(df)
+                stage['rows_out'] = len(korea_rows)
+            if len(korea_rows) == 0:
+                return file_result
+
+            with self.profiler.stage('indicators', csv_file, rows_in=len(df)) as stage:
+                indicators = self.identify_democracy_indicators(df, column_stats)
+                stage['rows_out'] = len(indicators)
+            with self.profiler.stage('years', csv_file, rows_in=len(korea_rows)) as stage:
+                years = self.extract_year_from_data(df, korea_rows)
+                stage['rows_out'] = len(years)
+            with self.profiler.stage('normalize', csv_file, rows_in=len(korea_rows)) as stage:
+                long_frame = self.extract_long_frame(df, korea_rows, indicators)
+                stage['rows_out'] = len(long_frame)
+
+            file_result.update({
+                'korea_rows': len(korea_rows),
+                'korea_columns': korea_columns,
+                'years': years,
+                'indicators': indicators,
+                'long_frame': long_frame
+            })
+        except Exception as e:
+            file_result['error'] = str(e)
+
+        return file_result
+
+    def extract_all_countries(self, df: pd.DataFrame, file_result: Dict[str, Any],
+                              column_stats: Optional[Dict[str, Tuple]] = None,
+                              csv_file: Optional[Path] = None) -> Dict[str, Any]:
+        with self.profiler.stage('match', csv_file, rows_in=len(df)) as stage:
+            country_keys, country_names, key_columns = self.resolve_country_keys(df)
+            rows = np.flatnonzero(pd.notna(country_keys))
+            stage['rows_out'] = len(rows)
+        if len(rows) == 0:
+            return file_result
+
+        with self.profiler.stage('years', csv_file, rows_in=len(rows)) as stage:
+            row_years = self.resolve_row_years(df, rows)
+            country_years = pd.DataFrame({'country': country_keys[rows], 'year': row_years}).dropna()
+            country_years = country_years.astype({'year': int}).drop_duplicates().sort_values('year')
+            stage['rows_out'] = len(country_years)
+
+        with self.profiler.stage('indicators', csv_file, rows_in=len(df)) as stage:
+            indicators = self.identify_democracy_indicators(df, column_stats)
+            stage['rows_out'] = len(indicators)
+        with self.profiler.stage('normalize', csv_file, rows_in=len(rows)) as stage:
+            long_frame = self.extract_long_frame(df, rows, indicators, country_keys)
+            stage['rows_out'] = len(long_frame)
+        file_result.update({
+            'korea_rows': len(rows),
+            'korea_columns': key_columns,
+            'years': sorted(country_years['year'].unique().tolist()),
+            'indicators': indicators,
+            'long_frame': long_frame,
+            'country_names': country_names,
+            'country_years': country_years.groupby('country')['year'].agg(list).to_dict()
+        })
+        return file_result
+
+    def list_dataset_names(self) -> List[str]:
+        return sorted(d.name for d in self.dataset_root.iterdir()
+                      if d.is_dir() and not d.name.startswith('.'))
+
+    def extract_files_parallel(self, dataset_names: List[str], jobs: int, all_countries: bool = False,
+                               dataset_files: Optional[Dict[str, List[Path]]] = None) -> Dict[str, List[Dict[str, Any]]]:
+        if dataset_files is None:
+            dataset_files = {dataset_name: self.list_dataset_files(dataset_name) for dataset_name in dataset_names}
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = {
+                dataset_name: [(csv_file, executor.submit(self.extract_file, csv_file, all_countries))
+                               for csv_file in dataset_files[dataset_name]]
+                for dataset_name in dataset_names
+            }
+
+            file_results = {}
+            for dataset_name, submitted in futures.items():
+                file_results[dataset_name] = []
+                for csv_file, future in submitted:
+                    try:
+                        file_results[dataset_name].append(future.result())
+                    except Exception as e:
+                        file_results[dataset_name].append({'file_name': csv_file.name, 'readable': False,
+                                                           'korea_rows': 0, 'error': str(e)})
+        return file_results
+
+    def process_dataset(self, dataset_name: str,
+                        file_results: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         dataset_path = self.dataset_root / dataset_name
         dataset_results = {
             'dataset_name': dataset_name,
             'files_processed': 0,
             'korea_data_found': 0,
+            'total_korea_rows': 0,
             'years_covered': [],
             'indicators_found': {},
-            'time_series_data': {}
+            'time_series_data': {},
+            'file_details': {},
+            'errors': []
         }
         
-        print(f"\nProcessing dataset: {dataset_name}")
+        logger.info(f"\nProcessing dataset: {dataset_name}")
         
         if not dataset_path.exists() or not dataset_path.is_dir():
-            print(f"Dataset directory not found: {dataset_path}")
+            logger.warning(f"Dataset directory not found: {dataset_path}")
             return dataset_results
 
-        csv_files = []
-        for root, dirs, files in os.walk(dataset_path):
-            for file in files:
-                if file.endswith('.csv') and not file.endswith('.sample'):
-                    csv_files.append(Path(root) / file)
+        if file_results is None:
+            file_results = [self.extract_file(csv_file) for csv_file in self.list_dataset_files(dataset_name)]
         
-        print(f"Found {len(csv_files)} CSV files")
+        logger.info(f"Found {len(file_results)} CSV files")
         
-        for csv_file in csv_files:
-            try:
-                print(f"  Processing: {csv_file.name}")
-                df = self.safe_read_csv(csv_file)
-                
-                if df is None:
-                    print(f"    Could not read file")
-                    continue
-                
+        for file_result in file_results:
+            self.profiler.absorb(file_result.get('profile'))
+            logger.debug(f"  Processing: {file_result['file_name']}")
+
+            if file_result.get('dialect'):
+                self.dialect_manifest.record(Path(file_result['file_path']), file_result['dialect'])
+
+            load_stats = file_result.get('load_stats')
+            if file_result.get('cached'):
+                logger.debug(f"    Loaded from parsed-file cache")
+            elif load_stats and load_stats['columns_loaded']:
+                peak = f", peak {load_stats['peak_bytes'] / 1024 / 1024:.1f} MB" if load_stats['peak_bytes'] else ""
+                if load_stats.get('peak_rss_bytes'):
+                    peak += (f", {load_stats['rows_kept']} rows kept from {load_stats['chunks']} chunks, "
+                             f"peak RSS {load_stats['peak_rss_bytes'] / 1024 / 1024:.1f} MB")
+                logger.debug(f"    Loaded {load_stats['columns_loaded']}/{load_stats['columns_total']} columns "
+                      f"in {load_stats['parse_seconds'] * 1000:.1f} ms, "
+                      f"{load_stats['frame_bytes'] / 1024 / 1024:.1f} MB in memory{peak}")
+
+            if file_result['readable']:
                 dataset_results['files_processed'] += 1
 
-                korea_rows, korea_columns = self.find_korea_data(df)
-                
-                if not korea_rows:
-                    print(f"    No Korea data found")
-                    continue
-                
-                dataset_results['korea_data_found'] += 1
-                print(f"    Found {len(korea_rows)} Korea rows in columns: {korea_columns}")
-                
-                years = self.extract_year_from_data(df, korea_rows)
-                dataset_results['years_covered'].extend(years)
-                
-                if years:
-                    print(f"    Years: {min(years)}-{max(years)} ({len(years)} years)")
-
-                indicators = self.identify_democracy_indicators(df)
-                print(f"    Democracy indicators found: {len(indicators)}")
-
-                for indicator_col, indicator_info in indicators.items():
-                    for row_idx in korea_rows:
-                        try:
-                            row_years = self.extract_year_from_data(df, [row_idx])
-                            if not row_years:
-                                continue
-                            
-                            year = row_years[0]
-                            raw_value = df.iloc[row_idx][indicator_col]
-                            
-                            if pd.notna(raw_value) and isinstance(raw_value, (int, float)):
-                                if indicator_info.get('scale_range'):
-                                    normalized_value = self.normalize_to_democracy_scale(
-                                        raw_value, 
-                                        indicator_info['scale_range'],
-                                        indicator_info.get('reverse', False)
-                                    )
-                                else:
-                                    if raw_value >= 0 and raw_value <= 1:
-                                        normalized_value = (raw_value - 0.5) * 20
-                                    elif raw_value >= 0 and raw_value <= 100:
-                                        normalized_value = ((raw_value / 100) - 0.5) * 20
-                                    else:
-                                        normalized_value = raw_value
-
-                                indicator_key = f"{dataset_name}_{indicator_col}"
-                                if indicator_key not in dataset_results['time_series_data']:
-                                    dataset_results['time_series_data'][indicator_key] = {
-                                        'name': indicator_info['name'],
-                                        'dataset': dataset_name,
-                                        'original_column': indicator_col,
-                                        'data': {}
-                                    }
-                                
-                                dataset_results['time_series_data'][indicator_key]['data'][year] = {
-                                    'raw_value': raw_value,
-                                    'normalized_value': normalized_value
-                                }
-                        except Exception as e:
-                            continue
-                
-                dataset_results['indicators_found'].update(indicators)
-                
-            except Exception as e:
-                print(f"     Error processing {csv_file.name}: {str(e)}")
+            if file_result['error']:
+                logger.warning(f"     Error processing {file_result['file_name']}: {file_result['error']}")
+                dataset_results['errors'].append({'file': file_result['file_name'], 'error': file_result['error']})
+                continue
+
+            if not file_result['readable']:
+                logger.debug(f"    Could not read file")
+                continue
+
+            if file_result['korea_rows'] == 0:
+                logger.debug(f"    No Korea data found")
                 continue
+            
+            dataset_results['korea_data_found'] += 1
+            dataset_results['total_korea_rows'] += file_result['korea_rows']
+            logger.debug(f"    Found {file_result['korea_rows']} Korea rows in columns: {file_result['korea_columns']}")
+            
+            years = file_result['years']
+            dataset_results['years_covered'].extend(years)
+            
+            if years:
+                logger.debug(f"    Years: {min(years)}-{max(years)} ({len(years)} years)")
+
+            indicators = file_result['indicators']
+            logger.debug(f"    Democracy indicators found: {len(indicators)}")
+
+            dialect = file_result.get('dialect') or {}
+            dataset_results['file_details'][file_result['file_name']] = {
+                'korea_rows': file_result['korea_rows'],
+                'years': years,
+                'korea_columns': file_result['korea_columns'],
+                'indicators': len(indicators),
+                'delimiter': dialect.get('delimiter'),
+                'encoding': dialect.get('encoding')
+            }
+
+            with self.profiler.stage('merge', file_result.get('file_path'),
+                                     rows_in=len(file_result['long_frame'])) as stage:
+                self.merge_long_frame(dataset_results['time_series_data'], file_result['long_frame'],
+                                      indicators, dataset_name)
+                stage['rows_out'] = len(dataset_results['time_series_data'])
+            dataset_results['indicators_found'].update(indicators)
 
         dataset_results['years_covered'] = sorted(list(set(dataset_results['years_covered'])))
         
-        print(f"  Dataset summary:")
-        print(f"    Files processed: {dataset_results['files_processed']}")
-        print(f"    Files with Korea data: {dataset_results['korea_data_found']}")
-        print(f"    Years covered: {len(dataset_results['years_covered'])}")
-        print(f"    Time series indicators: {len(dataset_results['time_series_data'])}")
+        logger.info(f"  Dataset summary:")
+        logger.info(f"    Files processed: {dataset_results['files_processed']}")
+        logger.info(f"    Files with Korea data: {dataset_results['korea_data_found']}")
+        logger.info(f"    Years covered: {len(dataset_results['years_covered'])}")
+        logger.info(f"    Time series indicators: {len(dataset_results['time_series_data'])}")
+        if dataset_results['errors']:
+            logger.warning(f"    Files with errors: {len(dataset_results['errors'])}")
         
         return dataset_results
 
-    def integrate_all_datasets(self) -> Dict[str, Any]:
-        print("=" * 80)
-        print("KOREA DEMOCRACY DATA INTEGRATION")
-        print("=" * 80)
+    def integrate_all_datasets(self, jobs: int = 1) -> Dict[str, Any]:
+        logger.info("=" * 80)
+        logger.info("KOREA DEMOCRACY DATA INTEGRATION")
+        logger.info("=" * 80)
         
         all_results = {}
-        all_years = set()
-        all_time_series = {}
 
-        dataset_dirs = [d for d in self.dataset_root.iterdir() if d.is_dir()]
+        dataset_names = self.list_dataset_names()
+        self.build_country_index()
+
+        file_results = {}
+        if jobs > 1:
+            file_results = self.extract_files_parallel(dataset_names, jobs)
         
-        for dataset_dir in dataset_dirs:
-            dataset_name = dataset_dir.name
-            results = self.process_dataset(dataset_name)
-            all_results[dataset_name] = results
+        for dataset_name in dataset_names:
+            all_results[dataset_name] = self.process_dataset(dataset_name, file_results.get(dataset_name))
 
+        self.dialect_manifest.save()
+
+        return self.combine_dataset_results(all_results)
+
+    def integrate_incremental(self, manifest: BuildManifest, jobs: int = 1) -> Dict[str, Any]:
+        logger.info("=" * 80)
+        logger.info("KOREA DEMOCRACY DATA INTEGRATION (INCREMENTAL)")
+        logger.info("=" * 80)
+
+        dataset_names = self.list_dataset_names()
+        dataset_files = {dataset_name: self.list_dataset_files(dataset_name) for dataset_name in dataset_names}
+        csv_files = {csv_file.relative_to(self.dataset_root).as_posix(): csv_file
+                     for files in dataset_files.values() for csv_file in files}
+        changes = manifest.diff(csv_files)
+
+        known_aliases = {csv_files[key]: manifest.files[key]['aliases'] for key in changes['unchanged']}
+        self.build_country_index(known_aliases)
+
+        settings = dict(self.extraction_settings(), dataset_root=self.dataset_root.resolve().as_posix())
+        if settings != manifest.settings:
+            # a different country index or configuration invalidates every stored extraction
+            if manifest.settings is not None:
+                logger.info("Extraction settings changed; reprocessing every file")
+            changes['changed'].extend(changes['unchanged'])
+            changes['unchanged'] = []
+            manifest.datasets = {}
+            manifest.settings = settings
+
+        stale = set(changes['added']) | set(changes['changed'])
+        for change in ['added', 'changed', 'removed']:
+            if changes[change]:
+                logger.info(f"Files {change}: {', '.join(changes[change])}")
+        logger.info(f"Files unchanged: {len(changes['unchanged'])}")
+
+        pending = {dataset_name: [csv_file for csv_file in files
+                                  if csv_file.relative_to(self.dataset_root).as_posix() in stale]
+                   for dataset_name, files in dataset_files.items()}
+        if jobs > 1 and len(stale) > 1:
+            fresh = self.extract_files_parallel(dataset_names, jobs, dataset_files=pending)
+        else:
+            fresh = {dataset_name: [self.extract_file(csv_file) for csv_file in files]
+                     for dataset_name, files in pending.items()}
+        for dataset_name, files in pending.items():
+            for csv_file, file_result in zip(files, fresh[dataset_name]):
+                key = csv_file.relative_to(self.dataset_root).as_posix()
+                if file_result['error']:
+                    # not recorded, so the file is retried on the next run
+                    manifest.files.pop(key, None)
+                else:
+                    manifest.record(key, csv_file, known_aliases[csv_file], file_result)
+        for key in changes['removed']:
+            del manifest.files[key]
+
+        removed_datasets = {key.split('/', 1)[0] for key in changes['removed']}
+        all_results = {}
+        for dataset_name in dataset_names:
+            fresh_results = {csv_file: file_result for csv_file, file_result
+                             in zip(pending[dataset_name], fresh[dataset_name])}
+            if not fresh_results and dataset_name not in removed_datasets and dataset_name in manifest.datasets:
+                logger.info(f"\nReusing dataset: {dataset_name}")
+                all_results[dataset_name] = manifest.datasets[dataset_name]
+                continue
+
+            # stored series are merged again in file order, so the newest file still wins where points overlap
+            file_results = [fresh_results.get(csv_file)
+                            or manifest.files[csv_file.relative_to(self.dataset_root).as_posix()]['result']
+                            for csv_file in dataset_files[dataset_name]]
+            all_results[dataset_name] = self.process_dataset(dataset_name, file_results)
+            manifest.datasets[dataset_name] = all_results[dataset_name]
+
+        manifest.datasets = {dataset_name: manifest.datasets[dataset_name] for dataset_name in all_results}
+        manifest.save()
+        self.dialect_manifest.save()
+
+        results = self.combine_dataset_results(all_results)
+        results['changes'] = {change: keys for change, keys in changes.items() if change != 'unchanged'}
+        return results
+
+    def combine_dataset_results(self, all_results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        all_years = set()
+        all_time_series = {}
+        for results in all_results.values():
             all_years.update(results['years_covered'])
             all_time_series.update(results['time_series_data'])
 
         all_years = sorted(list(all_years))
         
-        print(f"\n{'='*20} INTEGRATION SUMMARY {'='*20}")
-        print(f"Total datasets processed: {len(all_results)}")
-        print(f"Overall time coverage: {min(all_years) if all_years else 'N/A'} - {max(all_years) if all_years else 'N/A'}")
-        print(f"Total years with data: {len(all_years)}")
-        print(f"Total time series indicators: {len(all_time_series)}")
+        logger.info(f"\n{'='*20} INTEGRATION SUMMARY {'='*20}")
+        logger.info(f"Total datasets processed: {len(all_results)}")
+        logger.info(f"Overall time coverage: {min(all_years) if all_years else 'N/A'} - {max(all_years) if all_years else 'N/A'}")
+        logger.info(f"Total years with data: {len(all_years)}")
+        logger.info(f"Total time series indicators: {len(all_time_series)}")
+
+        all_errors = [dict(error, dataset=dataset_name)
+                      for dataset_name, results in all_results.items() for error in results['errors']]
+        if all_errors:
+            logger.warning(f"Files with errors: {len(all_errors)}")
+            for error in all_errors:
+                logger.warning(f"  {error['dataset']}/{error['file']}: {error['error']}")
 
-        web_data = self.create_web_data_structure(all_years, all_time_series)
+        with self.profiler.stage('assembly', rows_in=len(all_time_series)) as stage:
+            web_data = self.create_web_data_structure(all_years, all_time_series)
+            stage['rows_out'] = len(web_data['timeline'])
         
         return {
             'dataset_results': all_results,
             'all_years': all_years,
             'time_series': all_time_series,
-            'web_data': web_data
+            'web_data': web_data,
+            'errors': all_errors
         }
 
-    def create_web_data_structure(self, all_years: List[int], time_series: Dict[str, Any]) -> Dict[str, Any]:
-        timeline_data = []
-        
-        for year in all_years:
-            year_data = {
-                'year': year,
-                'democracy_score': None,
-                'indicators': {},
-                'data_sources': []
+    def country_shard_name(self, country_key: str) -> str:
+        # ISO-anchored entities are named by their code; name-only entities keep their
+        # casefolded name tokens, accents included, behind a prefix no ISO code can take
+        if country_key.startswith('name:'):
+            return 'name_' + country_key[len('name:'):].replace(' ', '_') + '.json'
+        return country_key.lower() + '.json'
+
+    def integrate_all_countries(self, countries: Optional[List[str]] = None, jobs: int = 1,
+                                output_dir: str = "countries") -> Dict[str, Any]:
+        logger.info("=" * 80)
+        logger.info("ALL-COUNTRIES DEMOCRACY DATA INTEGRATION")
+        logger.info("=" * 80)
+
+        dataset_names = self.list_dataset_names()
+        self.build_country_index()
+
+        wanted = None
+        if countries:
+            resolved = {country: self.country_index.resolve_query(country) for country in countries}
+            unknown = [country for country, entity in resolved.items() if entity is None]
+            if unknown:
+                raise ValueError(f"Unknown countries: {', '.join(unknown)}")
+            wanted = set(resolved.values())
+
+        if jobs > 1:
+            file_results = self.extract_files_parallel(dataset_names, jobs, all_countries=True)
+        else:
+            file_results = {
+                dataset_name: [self.extract_file(csv_file, all_countries=True)
+                               for csv_file in self.list_dataset_files(dataset_name)]
+                for dataset_name in dataset_names
             }
 
-            year_indicators = []
-            
-            for series_key, series_info in time_series.items():
-                if year in series_info['data']:
-                    data_point = series_info['data'][year]
-                    year_data['indicators'][series_key] = {
-                        'name': series_info['name'],
-                        'dataset': series_info['dataset'],
-                        'raw_value': data_point['raw_value'],
-                        'normalized_value': data_point['normalized_value']
-                    }
-                    year_data['data_sources'].append(series_info['dataset'])
-                    year_indicators.append(data_point['normalized_value'])
+        country_series = {}
+        country_years = {}
+        country_dataset_years = {}
+        country_names = {}
+        all_errors = []
 
-            if year_indicators:
-                year_data['democracy_score'] = np.mean(year_indicators)
-                year_data['data_sources'] = list(set(year_data['data_sources']))
-            
-            timeline_data.append(year_data)
+        for dataset_name in dataset_names:
+            for file_result in file_results[dataset_name]:
+                self.profiler.absorb(file_result.get('profile'))
+                if file_result.get('dialect'):
+                    self.dialect_manifest.record(Path(file_result['file_path']), file_result['dialect'])
+                if file_result['error']:
+                    all_errors.append({'dataset': dataset_name, 'file': file_result['file_name'],
+                                       'error': file_result['error']})
+                    continue
+                if file_result['long_frame'] is None:
+                    continue
+
+                long_frame = file_result['long_frame']
+                if wanted is not None:
+                    long_frame = long_frame[long_frame['country'].isin(wanted)]
+                self.merge_country_long_frame(country_series, long_frame, file_result['indicators'], dataset_name)
+
+                for country_key, years in file_result['country_years'].items():
+                    if wanted is None or country_key in wanted:
+                        country_years.setdefault(country_key, set()).update(years)
+                        country_dataset_years.setdefault(country_key, {}).setdefault(dataset_name, set()).update(years)
+                for country_key, country_name in file_result['country_names'].items():
+                    country_names.setdefault(country_key, country_name)
+
+        self.dialect_manifest.save()
+
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+
+        index_entries = []
+        long_tables = []
+        shard_keys = {}
+        for country_key in sorted(country_years):
+            all_years = sorted(country_years[country_key])
+            time_series = country_series.get(country_key, {})
+            web_data = self.create_web_data_structure(all_years, time_series,
+                                                      country_name=country_names[country_key])
+            web_data = self.fill_data_gaps(web_data)
+
+            long_tables.append(self.build_long_table(web_data, country_name=country_names[country_key],
+                                                     country_key=country_key))
+
+            shard_name = self.country_shard_name(country_key)
+            if shard_name in shard_keys:
+                raise ValueError(f"Countries {shard_keys[shard_name]!r} and {country_key!r} "
+                                 f"both map to {shard_name}")
+            shard_keys[shard_name] = country_key
+            write_file_atomic(output_path / shard_name, self.encode_json(web_data))
+
+            coverage = YearCoverageMatrix(country_dataset_years.get(country_key, {}))
+            max_overlap = coverage.max_overlap()
+            common_period = coverage.longest_run(max_overlap) if max_overlap else None
+
+            index_entries.append({
+                'country_key': country_key,
+                'name': country_names[country_key],
+                'file': shard_name,
+                'year_range': web_data['metadata']['year_range'],
+                'indicators_count': len(time_series),
+                'datasets_count': len(coverage.datasets),
+                'common_period': {'min_datasets': max_overlap, 'years': list(common_period)} if common_period else None
+            })
+
+        index = {
+            'generated_at': datetime.now().isoformat(),
+            'countries_count': len(index_entries),
+            'countries': index_entries
+        }
+        write_file_atomic(output_path / 'index.json', self.encode_json(index, pretty=True))
+
+        long_table = None
+        if long_tables:
+            long_table = pd.concat(long_tables, ignore_index=True)
+            for column in ['country', 'country_key', 'dataset', 'indicator']:
+                long_table[column] = long_table[column].astype('category')
+            self.save_long_table(long_table, str(output_path / 'long_table'))
+
+        logger.info(f"Countries written: {len(index_entries)} ({output_path})")
+        if all_errors:
+            logger.warning(f"Files with errors: {len(all_errors)}")
+            for error in all_errors:
+                logger.warning(f"  {error['dataset']}/{error['file']}: {error['error']}")
+
+        return {
+            'index': index,
+            'output_dir': str(output_path),
+            'long_table': long_table,
+            'errors': all_errors
+        }
+
+    def create_web_data_structure(self, all_years: List[int], time_series: Dict[str, Any],
+                                  country_name: str = 'South Korea') -> Dict[str, Any]:
+        series_keys = list(time_series)
+        series_datasets = [time_series[series_key]['dataset'] for series_key in series_keys]
+        year_positions = {year: i for i, year in enumerate(all_years)}
+
+        normalized = np.zeros((len(all_years), len(series_keys)))
+        raw = np.empty((len(all_years), len(series_keys)), dtype=object)
+        points_normalized = np.empty((len(all_years), len(series_keys)), dtype=object)
+        mask = np.zeros((len(all_years), len(series_keys)), dtype=bool)
+
+        for column, series_key in enumerate(series_keys):
+            points = [(year_positions[year], data_point) for year, data_point in time_series[series_key]['data'].items()
+                      if year in year_positions]
+            if not points:
+                continue
+            rows = np.fromiter((row for row, _ in points), dtype=np.intp, count=len(points))
+            normalized[rows, column] = [data_point['normalized_value'] for _, data_point in points]
+            points_normalized[rows, column] = [data_point['normalized_value'] for _, data_point in points]
+            raw[rows, column] = [data_point['raw_value'] for _, data_point in points]
+            mask[rows, column] = True
+
+        # Masked mean per year: valid values are packed to the left so rows sharing a
+        # count reduce together with the same summation order as np.mean on a list.
+        counts = mask.sum(axis=1)
+        packed = np.take_along_axis(normalized, np.argsort(~mask, axis=1, kind='stable'), axis=1)
+        scores = np.full(len(all_years), np.nan)
+        for count in np.unique(counts[counts > 0]):
+            rows = counts == count
+            scores[rows] = np.ascontiguousarray(packed[rows, :count]).sum(axis=1) / count
+
+        series_names = [time_series[series_key]['name'] for series_key in series_keys]
+        normalized_rows = points_normalized.tolist()
+        raw_rows = raw.tolist()
+        score_values = scores.tolist()
+
+        timeline_data = []
+        for row, year in enumerate(all_years):
+            columns = np.flatnonzero(mask[row]).tolist()
+            normalized_row = normalized_rows[row]
+            raw_row = raw_rows[row]
+            timeline_data.append({
+                'year': year,
+                'democracy_score': score_values[row] if columns else None,
+                'indicators': {
+                    series_keys[column]: {
+                        'name': series_names[column],
+                        'dataset': series_datasets[column],
+                        'raw_value': raw_row[column],
+                        'normalized_value': normalized_row[column]
+                    }
+                    for column in columns
+                },
+                'data_sources': list(dict.fromkeys(series_datasets[column] for column in columns))
+            })
 
         metadata = {
             'generated_at': datetime.now().isoformat(),
@@ -397,9 +2050,9 @@ class KoreaDemocracyDataIntegrator:
                 'start': min(all_years) if all_years else None,
                 'end': max(all_years) if all_years else None
             },
-            'datasets_used': list(set(series_info['dataset'] for series_info in time_series.values())),
+            'datasets_used': list(dict.fromkeys(series_info['dataset'] for series_info in time_series.values())),
             'indicators_count': len(time_series),
-            'description': 'South Korea democracy indicators integrated from multiple datasets',
+            'description': f'{country_name} democracy indicators integrated from multiple datasets',
             'democracy_score_scale': {
                 'min': -10,
                 'max': 10,
@@ -422,73 +2075,402 @@ class KoreaDemocracyDataIntegrator:
         
         return web_data
 
-    def fill_data_gaps(self, web_data: Dict[str, Any]) -> Dict[str, Any]:
+    def fill_gap_values(self, values: np.ndarray, fill_mask: np.ndarray, method: str) -> np.ndarray:
+        n = values.shape[0]
+        positions = np.arange(n).reshape((n,) + (1,) * (values.ndim - 1))
+        valid = ~np.isnan(values)
+
+        prev_idx = np.maximum.accumulate(np.where(valid, positions, -1), axis=0)
+        filled = values.copy()
+        gaps = fill_mask.reshape(positions.shape) & ~valid & (prev_idx >= 0)
+
+        if method == 'ffill':
+            source = np.take_along_axis(values, np.maximum(prev_idx, 0), axis=0)
+            filled[gaps] = source[gaps]
+            return filled
+
+        next_idx = np.flip(np.minimum.accumulate(np.flip(np.where(valid, positions, n), axis=0), axis=0), axis=0)
+        gaps &= next_idx < n
+
+        x1 = np.broadcast_to(prev_idx, values.shape)
+        x2 = np.broadcast_to(next_idx, values.shape)
+        y1 = np.take_along_axis(values, np.maximum(prev_idx, 0), axis=0)
+        y2 = np.take_along_axis(values, np.minimum(next_idx, n - 1), axis=0)
+        x = np.broadcast_to(positions, values.shape)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            interpolated = y1 + (y2 - y1) * (x - x1) / (x2 - x1)
+        filled[gaps] = interpolated[gaps]
+        return filled
+
+    def fill_data_gaps(self, web_data: Dict[str, Any], method: Optional[str] = None) -> Dict[str, Any]:
+        method = method or self.gap_fill_method
         timeline = web_data['timeline']
         
-        if len(timeline) < 2:
+        if len(timeline) < 2 or method == 'none':
             return web_data
 
         timeline.sort(key=lambda x: x['year'])
 
         start_year = timeline[0]['year']
-        end_year = timeline[-1]['year']
-        
+        n_years = timeline[-1]['year'] - start_year + 1
+        series_keys = list(web_data.get('indicators_info', {}))
+        series_columns = {series_key: i for i, series_key in enumerate(series_keys)}
+
+        existing = [None] * n_years
+        scores = np.full(n_years, np.nan)
+        normalized = np.full((n_years, len(series_keys)), np.nan)
+        raw = np.full((n_years, len(series_keys)), np.nan)
+
+        for item in timeline:
+            position = item['year'] - start_year
+            existing[position] = item
+            if item['democracy_score'] is not None:
+                scores[position] = item['democracy_score']
+            for series_key, indicator in item['indicators'].items():
+                column = series_columns.get(series_key)
+                if column is None:
+                    continue
+                if indicator['normalized_value'] is not None:
+                    normalized[position, column] = indicator['normalized_value']
+                if isinstance(indicator['raw_value'], (int, float)):
+                    raw[position, column] = indicator['raw_value']
+
+        missing = np.array([item is None for item in existing])
+        filled_scores = self.fill_gap_values(scores, missing, method)
+        filled_normalized = self.fill_gap_values(normalized, missing, method)
+        filled_raw = self.fill_gap_values(raw, missing, method)
+
         filled_timeline = []
-        
-        for year in range(start_year, end_year + 1):
-            existing_data = next((item for item in timeline if item['year'] == year), None)
-            
-            if existing_data:
-                filled_timeline.append(existing_data)
-            else:
-                interpolated_data = {
-                    'year': year,
-                    'democracy_score': None,
-                    'indicators': {},
-                    'data_sources': ['interpolated']
+        for position in range(n_years):
+            if existing[position] is not None:
+                filled_timeline.append(existing[position])
+                continue
+
+            interpolated_data = {
+                'year': start_year + position,
+                'democracy_score': None,
+                'indicators': {},
+                'data_sources': ['interpolated'],
+                'interpolated': True
+            }
+            if not np.isnan(filled_scores[position]):
+                interpolated_data['democracy_score'] = float(filled_scores[position])
+
+            for column in np.flatnonzero(~np.isnan(filled_normalized[position])):
+                series_key = series_keys[column]
+                series_info = web_data['indicators_info'][series_key]
+                raw_value = filled_raw[position, column]
+                interpolated_data['indicators'][series_key] = {
+                    'name': series_info['name'],
+                    'dataset': series_info['dataset'],
+                    'raw_value': None if np.isnan(raw_value) else float(raw_value),
+                    'normalized_value': float(filled_normalized[position, column]),
+                    'interpolated': True
                 }
 
-                before_data = None
-                after_data = None
-                
-                for item in timeline:
-                    if item['year'] < year and item['democracy_score'] is not None:
-                        before_data = item
-                    elif item['year'] > year and item['democracy_score'] is not None:
-                        after_data = item
-                        break
-                
-                if before_data and after_data:
-                    x1, y1 = before_data['year'], before_data['democracy_score']
-                    x2, y2 = after_data['year'], after_data['democracy_score']
-                    
-                    interpolated_score = y1 + (y2 - y1) * (year - x1) / (x2 - x1)
-                    interpolated_data['democracy_score'] = interpolated_score
-                
-                filled_timeline.append(interpolated_data)
+            filled_timeline.append(interpolated_data)
         
         web_data['timeline'] = filled_timeline
         web_data['metadata']['interpolation_applied'] = True
+        web_data['metadata']['interpolation_method'] = method
         
         return web_data
 
-    def save_web_data(self, web_data: Dict[str, Any], output_file: str = "korea_democracy_data.json"):
-        web_data = self.fill_data_gaps(web_data)
+    def build_columnar_payload(self, web_data: Dict[str, Any]) -> Dict[str, Any]:
+        timeline = web_data['timeline']
+        datasets = list(dict.fromkeys(
+            [series_info['dataset'] for series_info in web_data['indicators_info'].values()] +
+            [source for item in timeline for source in item['data_sources']]
+        ))
+        dataset_ids = {dataset: i for i, dataset in enumerate(datasets)}
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(web_data, f, indent=2, ensure_ascii=False, default=str)
-        
-        print(f"\nWeb-optimized data saved to: {output_file}")
+        indicators = {
+            series_key: {
+                'name': series_info['name'],
+                'dataset': series_info['dataset'],
+                'original_column': series_info.get('original_column'),
+                'raw_value': [None] * len(timeline),
+                'normalized_value': [None] * len(timeline),
+            }
+            for series_key, series_info in web_data['indicators_info'].items()
+        }
+        interpolated = []
 
-        compact_file = output_file.replace('.json', '_compact.json')
-        with open(compact_file, 'w', encoding='utf-8') as f:
-            json.dump(web_data, f, separators=(',', ':'), ensure_ascii=False, default=str)
-        
-        print(f"Compact version saved to: {compact_file}")
+        for position, item in enumerate(timeline):
+            if item.get('interpolated'):
+                interpolated.append(position)
+            for series_key, indicator in item['indicators'].items():
+                columns = indicators[series_key]
+                columns['raw_value'][position] = indicator['raw_value']
+                columns['normalized_value'][position] = indicator['normalized_value']
+
+        return {
+            'format': 'columnar',
+            'version': 1,
+            'metadata': web_data['metadata'],
+            'datasets': datasets,
+            'years': [item['year'] for item in timeline],
+            'democracy_score': [item['democracy_score'] for item in timeline],
+            'data_sources': [[dataset_ids[source] for source in item['data_sources']] for item in timeline],
+            'interpolated': interpolated,
+            'indicators': indicators,
+        }
+
+    def encode_json(self, payload: Any, pretty: bool = False) -> bytes:
+        native = to_native(payload, self.output_precision)
+        if pretty:
+            return json.dumps(native, indent=2, ensure_ascii=False).encode('utf-8')
+        return json.dumps(native, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    def write_compressed_siblings(self, output_file: str, payload: bytes) -> Dict[str, int]:
+        written = {}
+
+        gzip_file = output_file + '.gz'
+        compressed = gzip.compress(payload, compresslevel=9, mtime=0)
+        write_file_atomic(gzip_file, compressed)
+        written[gzip_file] = len(compressed)
+
+        if brotli is not None:
+            brotli_file = output_file + '.br'
+            compressed = brotli.compress(payload, quality=11)
+            write_file_atomic(brotli_file, compressed)
+            written[brotli_file] = len(compressed)
+
+        return written
+
+    def write_indicator_shards(self, payload: Dict[str, Any], output_dir: str) -> Path:
+        output_path = Path(output_dir)
+        shard_path = output_path / 'indicators'
+        shard_path.mkdir(parents=True, exist_ok=True)
+
+        manifest_indicators = {}
+        shard_files = set()
+        for series_key, series_info in payload['indicators'].items():
+            shard = {'key': series_key, **series_info}
+            shard_bytes = json.dumps(shard, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+            digest = hashlib.sha256(shard_bytes).hexdigest()[:12]
+            slug = re.sub(r'[^a-z0-9]+', '_', series_key.lower()).strip('_')
+            shard_name = f"{slug}.{digest}.json"
+
+            if not (shard_path / shard_name).exists():
+                write_file_atomic(shard_path / shard_name, shard_bytes)
+            shard_files.add(shard_name)
+
+            manifest_indicators[series_key] = {
+                'name': series_info['name'],
+                'dataset': series_info['dataset'],
+                'original_column': series_info['original_column'],
+                'observations': sum(value is not None for value in series_info['normalized_value']),
+                'shard': f"indicators/{shard_name}"
+            }
+
+        manifest = {key: value for key, value in payload.items() if key != 'indicators'}
+        manifest['format'] = 'sharded'
+        manifest['indicators'] = manifest_indicators
+
+        # pages that loaded the previous manifest may still fetch its shards, so that
+        # generation survives this write and is pruned by the next one
+        manifest_file = output_path / 'manifest.json'
+        previous_files = set()
+        if manifest_file.exists():
+            try:
+                with open(manifest_file, encoding='utf-8') as f:
+                    previous_manifest = json.load(f)
+                previous_files = {Path(info['shard']).name for info in previous_manifest['indicators'].values()}
+            except (OSError, ValueError, KeyError, TypeError, AttributeError):
+                previous_files = set()
+
+        write_file_atomic(manifest_file,
+                          json.dumps(manifest, separators=(',', ':'), ensure_ascii=False).encode('utf-8'))
+
+        for stale_file in shard_path.glob('*.json'):
+            if stale_file.name not in shard_files and stale_file.name not in previous_files:
+                stale_file.unlink()
+
+        return manifest_file
+
+    def build_long_table(self, web_data: Dict[str, Any], country_name: str = 'South Korea',
+                         country_key: Optional[str] = None) -> pd.DataFrame:
+        datasets, indicators, years, raw_values, normalized_values, interpolated = [], [], [], [], [], []
+
+        for item in web_data['timeline']:
+            year_interpolated = bool(item.get('interpolated', False))
+            for series_key, indicator in item['indicators'].items():
+                datasets.append(indicator['dataset'])
+                indicators.append(series_key)
+                years.append(item['year'])
+                raw_values.append(indicator['raw_value'])
+                normalized_values.append(indicator['normalized_value'])
+                interpolated.append(year_interpolated or bool(indicator.get('interpolated', False)))
+
+        return pd.DataFrame({
+            'country': pd.Categorical([country_name] * len(years)),
+            'country_key': pd.Categorical([country_key or self.target_country] * len(years)),
+            'dataset': pd.Categorical(datasets),
+            'indicator': pd.Categorical(indicators),
+            'year': np.array(years, dtype=np.int16),
+            'raw_value': pd.to_numeric(pd.Series(raw_values, dtype=object), errors='coerce').astype(np.float64),
+            'normalized_value': np.array(normalized_values, dtype=np.float64),
+            'interpolated': np.array(interpolated, dtype=bool)
+        })
+
+    def save_long_table(self, long_table: pd.DataFrame, output_base: str = "korea_democracy_long") -> List[str]:
+        # pyarrow is optional and slow to import, so it is only loaded when a table is written.
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            logger.warning("pyarrow is not installed; skipping Parquet/Arrow export of the long table")
+            return []
+
+        with self.profiler.stage('long_table', rows_in=len(long_table)) as stage:
+            table = pa.Table.from_pandas(long_table, preserve_index=False)
+
+            parquet_file = f"{output_base}.parquet"
+            pq.write_table(table, parquet_file)
+
+            # Uncompressed IPC file so readers can memory-map it without copying.
+            arrow_file = f"{output_base}.arrow"
+            with pa.OSFile(arrow_file, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            stage['rows_out'] = table.num_rows
+
+        logger.info(f"Long table saved to: {parquet_file}, {arrow_file} ({table.num_rows:,} rows)")
+        return [parquet_file, arrow_file]
+
+    def save_web_data(self, web_data: Dict[str, Any], output_file: str = "korea_democracy_data.json",
+                      precompress: bool = False) -> Dict[str, int]:
+        with self.profiler.stage('gap_fill', rows_in=len(web_data['timeline'])) as stage:
+            web_data = self.fill_data_gaps(web_data)
+            stage['rows_out'] = len(web_data['timeline'])
+
+        with self.profiler.stage('serialize', rows_in=len(web_data['timeline'])):
+            # converted and rounded once; the columnar payload and the shards are built from the native copy
+            web_data = to_native(web_data, self.output_precision)
+            pretty = json.dumps(web_data, indent=2, ensure_ascii=False).encode('utf-8')
+            write_file_atomic(output_file, pretty)
+
+            compact_file = output_file.replace('.json', '_compact.json')
+            columnar = self.build_columnar_payload(web_data)
+            payload = json.dumps(columnar, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+            write_file_atomic(compact_file, payload)
+            # .gz/.br siblings only help a server that serves them as-is with Content-Encoding (nginx gzip_static,
+            # brotli_static); GitHub Pages compresses on the fly and would hand them out as plain files
+            siblings = self.write_compressed_siblings(compact_file, payload) if precompress else {}
+
+            manifest_file = self.write_indicator_shards(columnar, os.path.splitext(output_file)[0])
+
+        output_sizes = {output_file: len(pretty), compact_file: len(payload), **siblings}
+        logger.info(f"\nWeb-optimized data saved to: {output_file} ({len(pretty):,} bytes)")
+        logger.info(f"Compact columnar version saved to: {compact_file} ({len(payload):,} bytes)")
+        for sibling, size in siblings.items():
+            logger.info(f"  Precompressed: {sibling} ({size:,} bytes)")
+        logger.info(f"Indicator manifest saved to: {manifest_file} ({len(columnar['indicators'])} shards)")
         
-        return output_file
+        return output_sizes
+
+    def build_coverage_report(self, integration_results: Dict[str, Any]) -> Dict[str, Any]:
+        # everything here comes from the extraction pass already made, so no file is read again
+        with self.profiler.stage('coverage', rows_in=len(integration_results['dataset_results'])):
+            datasets = {}
+            for dataset_name, results in integration_results['dataset_results'].items():
+                years = results['years_covered']
+                datasets[dataset_name] = {
+                    'files_analyzed': results['files_processed'],
+                    'files_with_korea': results['korea_data_found'],
+                    'total_korea_rows': results.get('total_korea_rows', 0),
+                    'years': years,
+                    'year_range': [min(years), max(years)] if years else None,
+                    'unique_years': len(years),
+                    'file_details': results.get('file_details', {})
+                }
+
+            dataset_years = {name: info['years'] for name, info in datasets.items() if info['years']}
+            coverage = YearCoverageMatrix(dataset_years)
+
+            # the highest number of datasets that still share a year, as long as at least two are compared
+            common_period = None
+            min_datasets = coverage.max_overlap()
+            if len(dataset_years) >= 2 and min_datasets:
+                start, end = coverage.longest_run(min_datasets)
+                common_period = {
+                    'min_datasets': min_datasets,
+                    'years': coverage.years_covered_by(min_datasets),
+                    'continuous_periods': [list(period) for period in coverage.runs(min_datasets)],
+                    'longest_period': [start, end],
+                    'contributing_datasets': coverage.overlapping(start, end)
+                }
+
+            recommendations = {}
+            if dataset_years:
+                covered_years = coverage.years_covered_by(1)
+                recommendations['overall_range'] = [covered_years[0], covered_years[-1]]
+                recommendations['unique_years'] = len(covered_years)
+                recommendations['top_datasets'] = [
+                    name for name, _ in sorted(dataset_years.items(), key=lambda item: len(item[1]), reverse=True)[:3]
+                ]
+                well_covered = coverage.years_covered_by(max(1, len(dataset_years) // 2))
+                if well_covered:
+                    recommendations['focus_period'] = [well_covered[0], well_covered[-1]]
+                    recommendations['focus_years'] = len(well_covered)
+
+        return {
+            'generated_at': datetime.now().isoformat(),
+            'target_country': self.target_country,
+            'files_analyzed': sum(info['files_analyzed'] for info in datasets.values()),
+            'files_with_korea': sum(info['files_with_korea'] for info in datasets.values()),
+            'datasets': datasets,
+            'common_period': common_period,
+            'recommendations': recommendations
+        }
+
+    def dataset_snapshot(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for dataset_name in self.list_dataset_names():
+            for csv_file in self.list_dataset_files(dataset_name):
+                try:
+                    stat = csv_file.stat()
+                except FileNotFoundError:
+                    continue
+                snapshot[csv_file.relative_to(self.dataset_root).as_posix()] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
 
-    def generate_data_summary(self, integration_results: Dict[str, Any]) -> str:
+    def watch_dataset(self, rebuild, interval: float = 1.0, debounce: float = 2.0):
+        # polls instead of using inotify so it also works on network and WSL mounts
+        logger.info(f"Watching {self.dataset_root} every {interval:g}s (debounce {debounce:g}s)")
+        snapshot = self.dataset_snapshot()
+        first_change = last_change = None
+        try:
+            while True:
+                time.sleep(interval)
+                current = self.dataset_snapshot()
+                now = time.monotonic()
+                if current != snapshot:
+                    changed = sorted(key for key in set(current) | set(snapshot) if current.get(key) != snapshot.get(key))
+                    logger.info(f"Changed: {', '.join(changed)}")
+                    snapshot = current
+                    first_change = first_change or now
+                    last_change = now
+                    continue
+                if last_change is None or now - last_change < debounce:
+                    continue
+
+                started = time.monotonic()
+                try:
+                    rebuild()
+                except Exception as e:
+                    logger.warning(f"Rebuild failed: {e}")
+                else:
+                    finished = time.monotonic()
+                    logger.info(f"Rebuilt in {finished - started:.2f}s, "
+                                f"{finished - first_change:.2f}s after the first change")
+                first_change = last_change = None
+        except KeyboardInterrupt:
+            logger.info("Stopped watching")
+
+    def generate_data_summary(self, integration_results: Dict[str, Any],
+                              output_sizes: Optional[Dict[str, int]] = None) -> str:
         web_data = integration_results['web_data']
         timeline = web_data['timeline']
         metadata = web_data['metadata']
@@ -531,7 +2513,8 @@ class KoreaDemocracyDataIntegrator:
         
         summary.append(f"\nWeb Integration:")
         summary.append(f"  Ready for web app: O")
-        summary.append(f"  JSON file size: ~{len(json.dumps(web_data))//1024}KB")
+        for output_file, size in (output_sizes or {}).items():
+            summary.append(f"  {os.path.basename(output_file)}: {size / 1024:.1f}KB")
         summary.append(f"  Performance optimized: O")
         
         summary.append(f"\nNext Steps:")
@@ -545,27 +2528,149 @@ class KoreaDemocracyDataIntegrator:
 
 if __name__ == "__main__":
     DATASET_ROOT = "/mnt/c/home/cs416/jl298.github.io/dataset"
-    
-    print("Starting Korea Democracy Data Integration...")
-    print(f"Dataset root: {DATASET_ROOT}")
-
-    integrator = KoreaDemocracyDataIntegrator(DATASET_ROOT)
-
-    results = integrator.integrate_all_datasets()
-
-    json_file = integrator.save_web_data(results['web_data'])
-
-    summary = integrator.generate_data_summary(results)
-    print(summary)
-    
-    with open("korea_democracy_integration_summary.txt", "w", encoding="utf-8") as f:
-        f.write(summary)
-
-    with open("korea_democracy_detailed_results.json", "w", encoding="utf-8") as f:
-        json.dump(results['dataset_results'], f, indent=2, ensure_ascii=False, default=str)
-    
-    print(f"\nIntegration Complete!")
-    print(f"Web data: {json_file}")
-    print(f"Summary: korea_democracy_integration_summary.txt")
-    print(f"Detailed results: korea_democracy_detailed_results.json")
-    print(f"\nReady to integrate with web app!")
+
+    parser = argparse.ArgumentParser(description="Integrate South Korea democracy indicators for the web app")
+    parser.add_argument('--dataset-root', default=DATASET_ROOT)
+    parser.add_argument('--jobs', type=int, default=1, help="worker processes for parsing CSV files")
+    parser.add_argument('--load-mode', choices=['full', 'projected', 'stream'], default='full',
+                        help="'projected' reads only country, year and indicator columns with compact dtypes; "
+                             "'stream' reads in chunks and keeps only rows of the target countries")
+    parser.add_argument('--memory-limit-mb', type=int, default=64, help="memory ceiling for --load-mode stream")
+    parser.add_argument('--trace-memory', action='store_true', help="report peak allocation while parsing each file")
+    parser.add_argument('--all-countries', action='store_true',
+                        help="parse each dataset once and write one timeline per country")
+    parser.add_argument('--countries', help="comma-separated country names to restrict --all-countries to")
+    parser.add_argument('--output-dir', default="countries", help="shard directory for --all-countries")
+    parser.add_argument('--gap-fill', choices=['linear', 'ffill', 'none'], default='linear',
+                        help="how years missing from every dataset are filled in the web timeline")
+    parser.add_argument('--precision', type=int, help="round floats in the JSON outputs to this many decimals")
+    parser.add_argument('--precompress', action='store_true',
+                        help="also write .gz (and .br with brotli installed) next to the compact payload, for servers "
+                             "that serve precompressed files with Content-Encoding; not needed on GitHub Pages")
+    parser.add_argument('--cache-dir', default=".korea_democracy_cache")
+    parser.add_argument('--cache-size-mb', type=int, default=256)
+    parser.add_argument('--no-cache', action='store_true', help="parse every CSV without reading or writing the cache")
+    parser.add_argument('--rebuild-cache', action='store_true', help="ignore cached entries and re-parse every CSV")
+    parser.add_argument('--incremental', action='store_true',
+                        help="reprocess only files added, changed or removed since the last incremental run")
+    parser.add_argument('--watch', action='store_true',
+                        help="keep running and rebuild incrementally whenever a CSV under the dataset root changes")
+    parser.add_argument('--poll-interval', type=float, default=1.0, help="seconds between dataset scans in --watch")
+    parser.add_argument('--debounce', type=float, default=2.0,
+                        help="seconds without further changes before --watch rebuilds")
+    parser.add_argument('--serve', action='store_true',
+                        help="integrate once, then answer timeline queries over HTTP instead of writing files")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--build-manifest', default=".korea_democracy_build.pkl",
+                        help="per-file hashes and extracted series kept between --incremental runs")
+    parser.add_argument('--profile', metavar='REPORT', help="write per-stage and per-file timings to this JSON file")
+    parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'], default='INFO',
+                        help="DEBUG adds per-file details and stage timings")
+    parser.add_argument('--quiet', action='store_true', help="only log warnings and errors (same as --log-level WARNING)")
+    args = parser.parse_args()
+
+    logging.basicConfig(format='%(message)s', level='WARNING' if args.quiet else args.log_level)
+
+    logger.info("Starting Korea Democracy Data Integration...")
+    logger.info(f"Dataset root: {args.dataset_root}")
+
+    cache = None
+    if not args.no_cache:
+        cache = ParsedFileCache(args.cache_dir, args.cache_size_mb * 1024 * 1024, rebuild=args.rebuild_cache)
+
+    integrator = KoreaDemocracyDataIntegrator(args.dataset_root, cache=cache,
+                                              load_mode=args.load_mode, trace_memory=args.trace_memory,
+                                              gap_fill_method=args.gap_fill, stream_memory_mb=args.memory_limit_mb,
+                                              profiler=StageProfiler(trace_memory=args.trace_memory),
+                                              output_precision=args.precision)
+
+    def save_profile():
+        if not args.profile:
+            return
+        report = integrator.profiler.save(args.profile)
+        logger.info(f"Profile saved to: {args.profile}")
+        for stage_name, totals in sorted(report['stages'].items(), key=lambda item: -item[1]['self_seconds']):
+            logger.info(f"  {stage_name}: {totals['self_seconds']:.3f}s self, {totals['count']} calls")
+
+    if args.serve:
+        if args.all_countries:
+            countries = ([country.strip() for country in args.countries.split(',') if country.strip()]
+                         if args.countries else None)
+            try:
+                long_table = integrator.integrate_all_countries(countries=countries, jobs=args.jobs,
+                                                                output_dir=args.output_dir)['long_table']
+            except ValueError as e:
+                logger.error(str(e))
+                raise SystemExit(1)
+        else:
+            web_data = integrator.fill_data_gaps(integrator.integrate_all_datasets(jobs=args.jobs)['web_data'])
+            long_table = integrator.build_long_table(web_data)
+
+        server = make_query_server(TimelineQueryStore(long_table), args.host, args.port)
+        logger.info(f"Serving /query, /countries and /indicators on http://{args.host}:{server.server_port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            logger.info("Stopped serving")
+        server.server_close()
+        raise SystemExit(0)
+
+    if args.all_countries:
+        countries = ([country.strip() for country in args.countries.split(',') if country.strip()]
+                     if args.countries else None)
+        try:
+            integrator.integrate_all_countries(countries=countries, jobs=args.jobs, output_dir=args.output_dir)
+        except ValueError as e:
+            logger.error(str(e))
+            raise SystemExit(1)
+        if cache is not None:
+            logger.info(f"Parsed-file cache: {cache.hits} hits, {cache.misses} misses ({args.cache_dir})")
+        save_profile()
+        raise SystemExit(0)
+
+    def write_outputs(results):
+        output_sizes = integrator.save_web_data(results['web_data'], precompress=args.precompress)
+        integrator.save_long_table(integrator.build_long_table(results['web_data']))
+
+        summary = integrator.generate_data_summary(results, output_sizes)
+        logger.info(summary)
+
+        write_file_atomic("korea_democracy_integration_summary.txt", summary.encode('utf-8'))
+        write_file_atomic("korea_democracy_detailed_results.json",
+                          integrator.encode_json(results['dataset_results'], pretty=True))
+        write_file_atomic("korea_democracy_coverage_report.json",
+                          integrator.encode_json(integrator.build_coverage_report(results), pretty=True))
+        return next(iter(output_sizes))
+
+    if args.watch:
+        manifest = BuildManifest(args.build_manifest)
+
+        def rebuild():
+            # each rebuild gets its own profile; a long watch session would otherwise keep every record
+            integrator.profiler.reset()
+            write_outputs(integrator.integrate_incremental(manifest, jobs=args.jobs))
+            save_profile()
+
+        rebuild()
+        integrator.watch_dataset(rebuild, interval=args.poll_interval, debounce=args.debounce)
+        raise SystemExit(0)
+
+    if args.incremental:
+        results = integrator.integrate_incremental(BuildManifest(args.build_manifest), jobs=args.jobs)
+    else:
+        results = integrator.integrate_all_datasets(jobs=args.jobs)
+
+    if cache is not None:
+        logger.info(f"Parsed-file cache: {cache.hits} hits, {cache.misses} misses ({args.cache_dir})")
+
+    json_file = write_outputs(results)
+
+    save_profile()
+
+    logger.info(f"\nIntegration Complete!")
+    logger.info(f"Web data: {json_file}")
+    logger.info(f"Summary: korea_democracy_integration_summary.txt")
+    logger.info(f"Detailed results: korea_democracy_detailed_results.json")
+    logger.info(f"Coverage report: korea_democracy_coverage_report.json")
+    logger.info(f"\nReady to integrate with web app!")
@@ -0,0 +1,37 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def write_polity(root, years=range(2000, 2006), korea_offset=0.0):
+    rows = []
+    for name, code, base in [('Korea South', 'ROK', 6.0), ('Korea North', 'PRK', -9.0), ('Japan', 'JPN', 10.0)]:
+        for year in years:
+            rows.append({'country': name, 'scode': code, 'year': year,
+                         'polity2': base + year % 2 + (korea_offset if code == 'ROK' else 0.0)})
+    rows.append({'country': 'Japan', 'scode': 'JPN', 'year': 1999, 'polity2': np.nan})
+    (root / 'Polity5').mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(rows).to_csv(root / 'Polity5' / 'p5.csv', index=False)
+
+
+def write_vdem(root, years=range(2000, 2006)):
+    rows = []
+    for name, code, base in [('South Korea', 'KOR', 0.7), ('North Korea', 'PRK', 0.01), ('Japan', 'JPN', 0.8)]:
+        for year in years:
+            rows.append({'country_name': name, 'country_text_id': code, 'year': year,
+                         'v2x_libdem': round(base + year % 3 * 0.01, 3)})
+    (root / 'V-Dem').mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(rows).to_csv(root / 'V-Dem' / 'v.csv', index=False)
+
+
+@pytest.fixture
+def dataset_root(tmp_path):
+    root = tmp_path / 'dataset'
+    write_polity(root)
+    write_vdem(root)
+    return root
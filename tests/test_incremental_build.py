@@ -0,0 +1,65 @@
+import json
+
+from conftest import write_polity, write_vdem
+from schema import BuildManifest, KoreaDemocracyDataIntegrator
+
+
+def web_output(results):
+    web_data = dict(results['web_data'], metadata=dict(results['web_data']['metadata'], generated_at=None))
+    return json.dumps(web_data, sort_keys=True)
+
+
+def incremental(dataset_root, manifest_path):
+    return KoreaDemocracyDataIntegrator(str(dataset_root)).integrate_incremental(BuildManifest(str(manifest_path)))
+
+
+def full(dataset_root):
+    return KoreaDemocracyDataIntegrator(str(dataset_root)).integrate_all_datasets()
+
+
+def test_first_run_adds_every_file_and_matches_a_full_build(tmp_path, dataset_root):
+    results = incremental(dataset_root, tmp_path / 'build.pkl')
+    assert results['changes'] == {'added': ['Polity5/p5.csv', 'V-Dem/v.csv'], 'changed': [], 'removed': []}
+    assert web_output(results) == web_output(full(dataset_root))
+
+
+def test_unchanged_tree_reprocesses_nothing(tmp_path, dataset_root):
+    incremental(dataset_root, tmp_path / 'build.pkl')
+    results = incremental(dataset_root, tmp_path / 'build.pkl')
+    assert results['changes'] == {'added': [], 'changed': [], 'removed': []}
+    assert web_output(results) == web_output(full(dataset_root))
+
+
+def test_changed_file_is_reprocessed(tmp_path, dataset_root):
+    incremental(dataset_root, tmp_path / 'build.pkl')
+    write_polity(dataset_root, korea_offset=1.0)
+    results = incremental(dataset_root, tmp_path / 'build.pkl')
+    assert results['changes']['changed'] == ['Polity5/p5.csv']
+    assert web_output(results) == web_output(full(dataset_root))
+
+
+def test_added_file_is_merged(tmp_path, dataset_root):
+    incremental(dataset_root, tmp_path / 'build.pkl')
+    write_vdem(tmp_path / 'extra', years=range(2006, 2009))
+    (tmp_path / 'extra' / 'V-Dem' / 'v.csv').rename(dataset_root / 'V-Dem' / 'w.csv')
+    results = incremental(dataset_root, tmp_path / 'build.pkl')
+    assert results['changes']['added'] == ['V-Dem/w.csv']
+    assert web_output(results) == web_output(full(dataset_root))
+    assert results['web_data']['metadata']['year_range']['end'] == 2008
+
+
+def test_removed_file_drops_its_series(tmp_path, dataset_root):
+    incremental(dataset_root, tmp_path / 'build.pkl')
+    (dataset_root / 'Polity5' / 'p5.csv').unlink()
+    results = incremental(dataset_root, tmp_path / 'build.pkl')
+    assert results['changes']['removed'] == ['Polity5/p5.csv']
+    assert web_output(results) == web_output(full(dataset_root))
+    assert not any('Polity5_polity2' in item['indicators'] for item in results['web_data']['timeline'])
+
+
+def test_settings_change_reprocesses_every_file(tmp_path, dataset_root):
+    incremental(dataset_root, tmp_path / 'build.pkl')
+    integrator = KoreaDemocracyDataIntegrator(str(dataset_root))
+    integrator.numeric_indicator_keywords = integrator.numeric_indicator_keywords + ['libdem']
+    results = integrator.integrate_incremental(BuildManifest(str(tmp_path / 'build.pkl')))
+    assert sorted(results['changes']['changed']) == ['Polity5/p5.csv', 'V-Dem/v.csv']
@@ -0,0 +1,83 @@
+import json
+import shutil
+
+from conftest import write_polity
+from schema import KoreaDemocracyDataIntegrator, ParsedFileCache
+
+
+def web_timeline(results):
+    return json.dumps(results['web_data']['timeline'], sort_keys=True)
+
+
+def test_hit_from_another_dataset_root_is_bound_to_the_current_path(tmp_path, dataset_root, monkeypatch):
+    cache_dir = tmp_path / 'cache'
+    first_dir = tmp_path / 'first'
+    first_dir.mkdir()
+    monkeypatch.chdir(first_dir)
+    first = KoreaDemocracyDataIntegrator('../dataset', cache=ParsedFileCache(str(cache_dir)))
+    expected = first.integrate_all_datasets()
+
+    moved_root = tmp_path / 'moved' / 'dataset'
+    shutil.copytree(dataset_root, moved_root, ignore=shutil.ignore_patterns('.dialects.json'))
+    monkeypatch.chdir(tmp_path / 'moved')
+    cache = ParsedFileCache(str(cache_dir))
+    second = KoreaDemocracyDataIntegrator(str(moved_root), cache=cache)
+    results = second.integrate_all_datasets()
+    file_results = [second.extract_file(csv_file)
+                    for dataset_name in second.list_dataset_names()
+                    for csv_file in second.list_dataset_files(dataset_name)]
+
+    assert cache.hits > 0
+    assert all(result['cached'] for result in file_results)
+    assert all(result['file_path'].startswith(str(moved_root)) for result in file_results)
+    assert web_timeline(results) == web_timeline(expected)
+    dialects = json.loads((moved_root / '.dialects.json').read_text(encoding='utf-8'))
+    assert sorted(dialects) == ['Polity5/p5.csv', 'V-Dem/v.csv']
+
+
+def test_entries_do_not_store_paths(tmp_path, dataset_root):
+    cache = ParsedFileCache(str(tmp_path / 'cache'))
+    integrator = KoreaDemocracyDataIntegrator(str(dataset_root), cache=cache)
+    csv_file = dataset_root / 'V-Dem' / 'v.csv'
+    integrator.extract_file(csv_file)
+
+    key = cache.file_key(csv_file, dict(integrator.extraction_settings(), all_countries=False))
+    entry = cache.get(key)
+    assert 'file_path' not in entry and 'file_name' not in entry
+
+
+def test_changed_content_misses(tmp_path, dataset_root):
+    cache = ParsedFileCache(str(tmp_path / 'cache'))
+    KoreaDemocracyDataIntegrator(str(dataset_root), cache=cache).integrate_all_datasets()
+    write_polity(dataset_root, korea_offset=1.0)
+
+    cache = ParsedFileCache(str(tmp_path / 'cache'))
+    results = KoreaDemocracyDataIntegrator(str(dataset_root), cache=cache).integrate_all_datasets()
+    # the edited file misses for both its country aliases and its extraction; the other file hits for both
+    assert (cache.hits, cache.misses) == (2, 2)
+    polity = results['dataset_results']['Polity5']['time_series_data']['Polity5_polity2']['data']
+    assert polity[2001]['raw_value'] == 8.0
+
+
+def test_key_covers_code_version_and_selection_settings(tmp_path, dataset_root):
+    cache = ParsedFileCache(str(tmp_path / 'cache'))
+    integrator = KoreaDemocracyDataIntegrator(str(dataset_root), cache=cache)
+    csv_file = dataset_root / 'V-Dem' / 'v.csv'
+
+    def key():
+        return cache.file_key(csv_file, integrator.extraction_settings())
+
+    baseline = key()
+    integrator.numeric_indicator_keywords = integrator.numeric_indicator_keywords + ['libdem']
+    with_keywords = key()
+    integrator.EXTRACTION_VERSION = KoreaDemocracyDataIntegrator.EXTRACTION_VERSION + 1
+    with_version = key()
+    assert len({baseline, with_keywords, with_version}) == 3
+
+
+def test_rebuild_ignores_existing_entries(tmp_path, dataset_root):
+    KoreaDemocracyDataIntegrator(str(dataset_root), cache=ParsedFileCache(str(tmp_path / 'cache'))).integrate_all_datasets()
+
+    cache = ParsedFileCache(str(tmp_path / 'cache'), rebuild=True)
+    KoreaDemocracyDataIntegrator(str(dataset_root), cache=cache).integrate_all_datasets()
+    assert cache.hits == 0 and cache.misses > 0
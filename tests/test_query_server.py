@@ -0,0 +1,87 @@
+import gzip
+import http.client
+import json
+import threading
+
+import pandas as pd
+import pytest
+
+from schema import TimelineQueryStore, make_query_server
+
+
+def long_table():
+    rows = []
+    for country, country_key in [('South Korea', 'KOR'), ('Kosovo', 'XKO'), ('Kosovo', 'XKX')]:
+        for year in range(1990, 2025):
+            rows.append({'country': country, 'country_key': country_key, 'dataset': 'V-Dem',
+                         'indicator': 'V-Dem_v2x_libdem', 'year': year, 'raw_value': 0.5 + year % 7 / 100,
+                         'normalized_value': (year % 7) / 5, 'interpolated': False})
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture(scope='module')
+def server():
+    server = make_query_server(TimelineQueryStore(long_table()), port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def get(server, path, headers=None):
+    connection = http.client.HTTPConnection('127.0.0.1', server.server_port)
+    connection.request('GET', path, headers=headers or {})
+    response = connection.getresponse()
+    body = response.read()
+    connection.close()
+    return response, body
+
+
+def test_identity_and_gzip_bodies_have_their_own_etags(server):
+    plain, plain_body = get(server, '/query?country=KOR')
+    packed, packed_body = get(server, '/query?country=KOR', {'Accept-Encoding': 'gzip'})
+    assert plain.status == packed.status == 200
+    assert packed.getheader('Content-Encoding') == 'gzip'
+    assert gzip.decompress(packed_body) == plain_body
+    assert plain.getheader('ETag') != packed.getheader('ETag')
+    assert packed.getheader('Vary') == plain.getheader('Vary') == 'Accept-Encoding'
+
+
+def test_revalidation_matches_only_the_encoding_it_was_issued_for(server):
+    plain_etag = get(server, '/query?country=KOR')[0].getheader('ETag')
+    packed_etag = get(server, '/query?country=KOR', {'Accept-Encoding': 'gzip'})[0].getheader('ETag')
+
+    assert get(server, '/query?country=KOR', {'If-None-Match': plain_etag})[0].status == 304
+    assert get(server, '/query?country=KOR', {'If-None-Match': packed_etag,
+                                              'Accept-Encoding': 'gzip'})[0].status == 304
+    assert get(server, '/query?country=KOR', {'If-None-Match': packed_etag})[0].status == 200
+
+
+@pytest.mark.parametrize('header, status', [
+    ('*', 304),
+    ('"0000", {etag}', 304),
+    ('W/{etag}', 304),
+    ('"0000", "1111"', 200),
+    ('"a,b", {etag}', 304),
+])
+def test_if_none_match_lists_and_wildcard(server, header, status):
+    etag = get(server, '/query?country=KOR&start=2000')[0].getheader('ETag')
+    response, body = get(server, '/query?country=KOR&start=2000', {'If-None-Match': header.format(etag=etag)})
+    assert response.status == status
+    if status == 304:
+        assert body == b'' and response.getheader('ETag') == etag
+
+
+def test_wildcard_does_not_turn_errors_into_not_modified(server):
+    assert get(server, '/query?country=Atlantis', {'If-None-Match': '*'})[0].status == 404
+
+
+def test_entities_sharing_a_name_stay_apart(server):
+    response, body = get(server, '/query?country=Kosovo')
+    assert response.status == 400
+    assert 'XKO' in json.loads(body)['error'] and 'XKX' in json.loads(body)['error']
+
+    countries = json.loads(get(server, '/query?start=2020&end=2020')[1])['countries']
+    assert sorted(countries) == ['KOR', 'XKO', 'XKX']
+    assert countries['XKO']['name'] == countries['XKX']['name'] == 'Kosovo'
+    assert json.loads(get(server, '/query?country=xkx')[1])['countries']['XKX']['year'][0] == 1990